@@ -0,0 +1,349 @@
+"""Benchmarks for the tile rendering hot path.
+
+Run all benchmarks and print results::
+
+    python benchmarks/tile_bench.py
+
+Save results of a run and compare a later run against it::
+
+    python benchmarks/tile_bench.py --save before.json
+    python benchmarks/tile_bench.py --save after.json
+    python benchmarks/tile_bench.py --compare before.json after.json
+
+Run selected benchmarks only::
+
+    python benchmarks/tile_bench.py wide_layout secured
+"""
+from cone.tile import register_tile
+from cone.tile import render_tile
+from cone.tile import render_tiles
+from cone.tile import Tile
+from pyramid import testing
+from pyramid.authentication import CallbackAuthenticationPolicy
+from pyramid.authorization import ACLAuthorizationPolicy
+from pyramid.interfaces import IAuthenticationPolicy
+from pyramid.interfaces import IAuthorizationPolicy
+from pyramid.interfaces import IDebugLogger
+from pyramid.security import Allow
+from pyramid.security import Everyone
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+
+TILE_TEMPLATE = 'cone.tile:testdata/tile1.pt'
+NESTED_TEMPLATE = 'cone.tile:testdata/tile2.pt'
+
+
+class NullLogger(object):
+
+    def debug(self, msg):
+        pass
+
+    info = warn = error = debug
+
+
+class Model(testing.DummyResource):
+    path = [None]
+    __acl__ = [(Allow, Everyone, ['view'])]
+
+
+class AttributeTile(Tile):
+
+    def render(self):
+        return u'<span>Attribute</span>'
+
+
+class NestingTile(Tile):
+    depth = 0
+
+    def render(self):
+        if not self.depth:
+            return u'<span>Leaf</span>'
+        child = 'nested_{}'.format(self.depth - 1)
+        return u'<div>{}</div>'.format(render_tile(
+            self.model,
+            self.request,
+            child
+        ))
+
+
+def make_nesting_tile(depth):
+    return type('NestingTile{}'.format(depth), (NestingTile,), {
+        'depth': depth
+    })
+
+
+class Environment(object):
+    """Pyramid test environment with registered tiles.
+    """
+
+    def __init__(self, wide=50, deep=20):
+        self.wide = wide
+        self.deep = deep
+
+    def setup(self):
+        self.config = testing.setUp(settings={})
+        self.registry = self.config.registry
+        self.registry.registerUtility(NullLogger(), IDebugLogger)
+        self.register_tiles()
+        self.model = Model()
+
+    def teardown(self):
+        testing.tearDown()
+
+    def enable_security(self):
+        authn = CallbackAuthenticationPolicy()
+        authn.callback = lambda userid, request: ['role:editor']
+        authn.unauthenticated_userid = lambda request: 'user'
+        self.registry.registerUtility(authn, IAuthenticationPolicy)
+        self.registry.registerUtility(
+            ACLAuthorizationPolicy(),
+            IAuthorizationPolicy
+        )
+
+    def register_tiles(self):
+        register_tile(name='tileone', path=TILE_TEMPLATE, permission=None)
+        register_tile(name='template', path=TILE_TEMPLATE, permission=None)
+        register_tile(
+            name='attribute',
+            class_=AttributeTile,
+            permission=None
+        )
+        for index in range(self.wide):
+            register_tile(
+                name='wide_{}'.format(index),
+                class_=AttributeTile,
+                permission=None
+            )
+        for depth in range(self.deep):
+            register_tile(
+                name='nested_{}'.format(depth),
+                class_=make_nesting_tile(depth),
+                permission=None
+            )
+        self.enable_security()
+        # same tile with and without permission check for comparison
+        register_tile(name='secured', class_=AttributeTile, permission='view')
+        register_tile(name='unsecured', class_=AttributeTile, permission=None)
+
+    def request(self):
+        request = testing.DummyRequest()
+        request.registry = self.registry
+        return request
+
+    def reset_caches(self):
+        for attr in ('_cone_tile_index', '_cone_tile_renderers'):
+            if hasattr(self.registry, attr):
+                delattr(self.registry, attr)
+
+
+def bench_attribute(env):
+    render_tile(env.model, env.request(), 'attribute')
+
+
+def bench_template(env):
+    render_tile(env.model, env.request(), 'template')
+
+
+def bench_secured(env):
+    render_tile(env.model, env.request(), 'secured')
+
+
+def bench_unsecured(env):
+    render_tile(env.model, env.request(), 'unsecured')
+
+
+def bench_deep_nesting(env):
+    render_tile(env.model, env.request(), 'nested_{}'.format(env.deep - 1))
+
+
+def bench_wide_layout(env):
+    request = env.request()
+    for index in range(env.wide):
+        render_tile(env.model, request, 'wide_{}'.format(index))
+
+
+def bench_wide_layout_batch(env):
+    names = ['wide_{}'.format(index) for index in range(env.wide)]
+    render_tiles(env.model, env.request(), names)
+
+
+def bench_cold_registry(env):
+    env.reset_caches()
+    render_tile(env.model, env.request(), 'template')
+
+
+def bench_warm_registry(env):
+    render_tile(env.model, env.request(), 'template')
+
+
+def bench_register_tile(env):
+    register_tile(name='registered', class_=AttributeTile, permission='view')
+
+
+BENCHMARKS = [
+    ('attribute', bench_attribute),
+    ('template', bench_template),
+    ('secured', bench_secured),
+    ('unsecured', bench_unsecured),
+    ('deep_nesting', bench_deep_nesting),
+    ('wide_layout', bench_wide_layout),
+    ('wide_layout_batch', bench_wide_layout_batch),
+    ('cold_registry', bench_cold_registry),
+    ('warm_registry', bench_warm_registry),
+    ('register_tile', bench_register_tile),
+]
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(percent / 100. * (len(values) - 1))))
+    return values[index]
+
+
+def run_benchmark(env, func, rounds, warmup):
+    for _ in range(warmup):
+        func(env)
+    timings = list()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            func(env)
+            timings.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    # allocations are measured in a separate pass, tracing distorts timings
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        alloc_rounds = max(1, rounds // 10)
+        for _ in range(alloc_rounds):
+            func(env)
+        peak = tracemalloc.get_traced_memory()[1]
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    blocks = sum(stat.count_diff for stat in stats)
+    total = sum(timings)
+    return dict(
+        rounds=rounds,
+        ops_per_sec=rounds / total if total else 0.,
+        mean_us=total / rounds * 1e6,
+        p50_us=percentile(timings, 50) * 1e6,
+        p90_us=percentile(timings, 90) * 1e6,
+        p99_us=percentile(timings, 99) * 1e6,
+        peak_kib=peak / 1024.,
+        retained_blocks=blocks / float(alloc_rounds)
+    )
+
+
+def run(names, rounds, warmup):
+    env = Environment()
+    env.setup()
+    try:
+        results = dict()
+        for name, func in BENCHMARKS:
+            if names and name not in names:
+                continue
+            results[name] = run_benchmark(env, func, rounds, warmup)
+        return results
+    finally:
+        env.teardown()
+
+
+COLUMNS = [
+    ('ops_per_sec', 'ops/s', '{:.0f}'),
+    ('mean_us', 'mean us', '{:.1f}'),
+    ('p50_us', 'p50 us', '{:.1f}'),
+    ('p90_us', 'p90 us', '{:.1f}'),
+    ('p99_us', 'p99 us', '{:.1f}'),
+    ('peak_kib', 'peak KiB', '{:.1f}'),
+    ('retained_blocks', 'blocks/op', '{:.1f}'),
+]
+
+
+def print_results(results, out=sys.stdout):
+    header = ['benchmark'] + [title for _, title, _ in COLUMNS]
+    rows = [header]
+    for name, result in results.items():
+        rows.append([name] + [
+            fmt.format(result[key]) for key, _, fmt in COLUMNS
+        ])
+    print_table(rows, out)
+
+
+def print_comparison(base, current, out=sys.stdout):
+    keys = [('ops_per_sec', 'ops/s'), ('p50_us', 'p50 us'),
+            ('p99_us', 'p99 us'), ('peak_kib', 'peak KiB')]
+    header = ['benchmark']
+    for _, title in keys:
+        header += [title + ' base', title + ' now', 'delta']
+    rows = [header]
+    for name, result in current.items():
+        if name not in base:
+            continue
+        row = [name]
+        for key, _ in keys:
+            before, after = base[name][key], result[key]
+            delta = (after - before) / before * 100. if before else 0.
+            row += [
+                '{:.1f}'.format(before),
+                '{:.1f}'.format(after),
+                '{:+.1f}%'.format(delta)
+            ]
+        rows.append(row)
+    print_table(rows, out)
+
+
+def print_table(rows, out):
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        out.write('  '.join(
+            cell.ljust(width) if not i else cell.rjust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))
+        ))
+        out.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        'benchmarks',
+        nargs='*',
+        help='names of benchmarks to run, all if omitted: {}'.format(
+            ', '.join(name for name, _ in BENCHMARKS)
+        )
+    )
+    parser.add_argument('--rounds', type=int, default=2000)
+    parser.add_argument('--warmup', type=int, default=200)
+    parser.add_argument('--save', help='write results to JSON file')
+    parser.add_argument(
+        '--compare',
+        nargs=2,
+        metavar=('BASE', 'CURRENT'),
+        help='compare two saved JSON result files'
+    )
+    args = parser.parse_args(argv)
+    if args.compare:
+        with open(args.compare[0]) as f:
+            base = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        print_comparison(base, current)
+        return
+    results = run(args.benchmarks, args.rounds, args.warmup)
+    print_results(results)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,44 @@
+from cone.tile._api import check_freshness
+from cone.tile._api import child_urls
+from cone.tile._api import deferred_tile_url
+from cone.tile._api import effective_principals
+from cone.tile._api import has_tile
+from cone.tile._api import invalidate_node_urls
+from cone.tile._api import invalidate_security_cache
+from cone.tile._api import invalidate_tile_memo
 from cone.tile._api import ITile
+from cone.tile._api import node_url
+from cone.tile._api import prefetch_data
 from cone.tile._api import register_tile
+from cone.tile._api import register_tiles
 from cone.tile._api import render_template
 from cone.tile._api import render_template_to_response
 from cone.tile._api import render_tile
+from cone.tile._api import render_tile_async
+from cone.tile._api import render_tiles
+from cone.tile._api import render_tiles_async
 from cone.tile._api import render_to_response
+from cone.tile._api import stream_tiles_to_response
 from cone.tile._api import Tile
 from cone.tile._api import tile
 from cone.tile._api import TileRenderer
+from cone.tile._cache import CachePolicy
+from cone.tile._cache import ITileCache
+from cone.tile._cache import MemoryTileCache
+from cone.tile._data import get_data
+from cone.tile._data import ITileDataProvider
+from cone.tile._data import register_data_provider
+from cone.tile._profile import enable_profiling
+from cone.tile._profile import get_profile
+from cone.tile._profile import ITileRendered
+from cone.tile._profile import TileProfile
+from cone.tile._profile import TileRendered
+from cone.tile._profile import TileStats
+from cone.tile._profile import TileTiming
+from cone.tile._shared import SharedTileCache
+from cone.tile._view import bulk_tiles_view
+from cone.tile._view import deferred_tile_view
+from cone.tile._view import includeme
 from zope.deprecation import deprecated
 
 
@@ -1,6 +1,14 @@
+from cone.tile._data import DATA_KEY
+from cone.tile._data import fetch_data
+from cone.tile._data import get_data
+from cone.tile._profile import get_profile
+from cone.tile._profile import TileRendered
 from pyramid_chameleon.zpt import ZPTTemplateRenderer
 from pyramid.config.views import preserve_view_attrs
+from datetime import datetime
+from datetime import timezone
 from pyramid.httpexceptions import HTTPForbidden
+from pyramid.httpexceptions import HTTPNotModified
 from pyramid.interfaces import IAuthenticationPolicy
 from pyramid.interfaces import IAuthorizationPolicy
 from pyramid.interfaces import IDebugLogger
@@ -10,24 +18,38 @@ from pyramid.interfaces import ISecuredView
 from pyramid.interfaces import IViewClassifier
 from pyramid.path import caller_package
 from pyramid.renderers import RendererHelper
+from pyramid.settings import asbool
 from pyramid_chameleon.renderer import template_renderer_factory
 from pyramid.threadlocal import get_current_registry
+from pyramid.threadlocal import manager
 try:  # pragma: no coverage
     from urllib import quote
+    from urllib import urlencode
 except ImportError:  # pragma: no coverage
     from urllib.parse import quote
+    from urllib.parse import urlencode
 from webob import Response
+from webob.datetime_utils import parse_date
+from webob.datetime_utils import serialize_date
 from webob.exc import HTTPFound
 from zope.component import ComponentLookupError
 from zope.interface import Attribute
 from zope.interface import Interface
 from zope.interface import implementer
+from zope.interface import providedBy
 try:  # pragma: no coverage
     import html
 except ImportError:  # pragma: no coverage
     import cgi as html
+import asyncio
+import concurrent.futures
+import gzip
+import hashlib
+import inspect
 import os
 import sys
+import threading
+import time
 import traceback
 import venusian
 
@@ -56,6 +78,14 @@ class ITile(Interface):
         """
 
 
+def _awaitable(ob):
+    """Check whether ob is awaitable. Shortcut for strings.
+    """
+    return ob is not None \
+        and not isinstance(ob, str) \
+        and inspect.isawaitable(ob)
+
+
 def _update_kw(**kw):
     if not ('request' in kw and 'model' in kw):
         raise ValueError('Expected kwargs missing: model, request.')
@@ -69,6 +99,31 @@ def _redirect(kw):
     return False
 
 
+def _template_renderer(path, registry):
+    """Lookup template renderer for path.
+
+    Resolved renderers are memoized on the registry unless
+    ``reload_templates`` or ``reload_assets`` is enabled.
+    """
+    settings = registry.settings or {}
+    reload = asbool(settings.get('reload_templates')) \
+        or asbool(settings.get('reload_assets'))
+    if reload:
+        info = RendererHelper(name=path, registry=registry)
+        return template_renderer_factory(info, ZPTTemplateRenderer)
+    renderers = getattr(registry, '_cone_tile_renderers', None)
+    if renderers is None:
+        renderers = registry._cone_tile_renderers = dict()
+    renderer = renderers.get(path)
+    if renderer is not None:
+        return renderer
+    info = RendererHelper(name=path, registry=registry)
+    renderer = renderers[path] = template_renderer_factory(
+        info,
+        ZPTTemplateRenderer)
+    return renderer
+
+
 def render_template(path, **kw):
     """Render template considering redirect flag.
     """
@@ -77,9 +132,11 @@ def render_template(path, **kw):
         return u''
     if not (':' in path or os.path.isabs(path)):
         raise ValueError('Relative path not supported: {}'.format(path))
-    info = RendererHelper(name=path, registry=kw['request'].registry)
-    renderer = template_renderer_factory(info, ZPTTemplateRenderer)
+    renderer = _template_renderer(path, kw['request'].registry)
+    profile = get_profile(kw['request'])
     try:
+        if profile is not None:
+            return profile.timed('template', renderer, kw, {})
         return renderer(kw, {})
     except Exception:
         etype, value, tb = sys.exc_info()
@@ -96,8 +153,7 @@ def render_template_to_response(path, **kw):
     """
     kw = _update_kw(**kw)
     kw['request'].environ['redirect'] = None
-    info = RendererHelper(name=path, registry=kw['request'].registry)
-    renderer = template_renderer_factory(info, ZPTTemplateRenderer)
+    renderer = _template_renderer(path, kw['request'].registry)
     result = renderer(kw, {})
     if _redirect(kw):
         redirect = kw['request'].environ['redirect']
@@ -107,7 +163,7 @@ def render_template_to_response(path, **kw):
     response_factory = kw['request'].registry.queryUtility(
         IResponseFactory,
         default=Response)
-    return response_factory(result)
+    return _apply_freshness(kw['request'], response_factory(result))
 
 
 def render_to_response(request, result):
@@ -121,7 +177,295 @@ def render_to_response(request, result):
     response_factory = request.registry.queryUtility(
         IResponseFactory,
         default=Response)
-    return response_factory(result)
+    return _apply_freshness(request, response_factory(result))
+
+
+FRESHNESS_KEY = 'cone.tile.freshness'
+
+
+def _utc(dt):
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _freshness_headers(request):
+    """Return ETag and Last-Modified headers computed by ``check_freshness``
+    as dict.
+    """
+    etag, last_modified = request.environ[FRESHNESS_KEY]
+    headers = {'ETag': etag}
+    if last_modified is not None:
+        headers['Last-Modified'] = serialize_date(last_modified)
+    return headers
+
+
+def _apply_freshness(request, response):
+    """Set ETag and Last-Modified headers computed by ``check_freshness``
+    on response.
+    """
+    if request.environ.get(FRESHNESS_KEY) is not None:
+        response.headers.update(_freshness_headers(request))
+    return response
+
+
+def check_freshness(model, request, names):
+    """Check freshness of a page consisting of tiles.
+
+    Calls the ``freshness`` functions of the tiles given by ``names`` and
+    computes a weak ETag from the results, the tile names and the effective
+    principals of the current user. If all freshness functions return
+    datetimes, the most recent one is used as Last-Modified date.
+
+    ``model``
+        application model aka context
+
+    ``request``
+        the current request
+
+    ``names``
+        iterable of tile names. An item may also be a ``(name, model)`` tuple
+        for checking a tile on another model
+
+    Returns a ``HTTPNotModified`` instance if conditional request headers
+    match, otherwise ``None``. In the latter case ETag and Last-Modified
+    headers are set on the response created by
+    ``render_template_to_response``, ``render_to_response`` or
+    ``stream_tiles_to_response``. If a tile is
+    missing or was registered without freshness function, no headers are
+    computed and ``None`` is returned.
+    """
+    request.environ[FRESHNESS_KEY] = None
+    tokens = list()
+    for name, context, factory in _lookup_tiles(model, request, names):
+        freshness = getattr(factory, '__freshness__', None)
+        if freshness is None:
+            return None
+        token = freshness(context, request)
+        if token is None:
+            return None
+        tokens.append((name, token))
+    authn_policy = request.registry.queryUtility(IAuthenticationPolicy)
+    principals = list()
+    if authn_policy is not None:
+        principals = sorted(effective_principals(request, authn_policy))
+    digest = hashlib.sha1(repr([
+        [(name, str(token)) for name, token in tokens],
+        principals
+    ]).encode('utf-8')).hexdigest()
+    etag = 'W/"{}"'.format(digest)
+    last_modified = None
+    if tokens and all(isinstance(token, datetime) for _, token in tokens):
+        last_modified = max(_utc(token) for _, token in tokens)
+        last_modified = last_modified.replace(microsecond=0)
+    request.environ[FRESHNESS_KEY] = (etag, last_modified)
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match is not None:
+        candidates = [
+            candidate.strip() for candidate in if_none_match.split(',')
+        ]
+        # weak comparison
+        if etag in candidates or etag[2:] in candidates or '*' in candidates:
+            return HTTPNotModified(headers=_freshness_headers(request))
+        return None
+    if_modified_since = request.headers.get('If-Modified-Since')
+    if if_modified_since is not None and last_modified is not None:
+        modified_since = parse_date(if_modified_since)
+        if modified_since is not None and last_modified <= modified_since:
+            return HTTPNotModified(headers=_freshness_headers(request))
+    return None
+
+
+def _stream_tiles(request, head, tiles):
+    """Generator yielding encoded tiles. Remaining ``tiles`` are rendered
+    lazily while iterating, which happens after finished callbacks and tweens
+    have been processed.
+    """
+    for result in head:
+        yield result
+    if not tiles:
+        return
+    manager.push({'request': request, 'registry': request.registry})
+    try:
+        for name, context, factory in tiles:
+            result = _render_tile_bytes(factory, context, request, name, True)
+            if request.environ.get('redirect'):
+                msg = (
+                    u"Redirect triggered by tile '{}' after response "
+                    u"started streaming. Abort rendering."
+                ).format(name)
+                logger = request.registry.getUtility(IDebugLogger)
+                logger.debug(msg)
+                return
+            yield result
+    finally:
+        manager.pop()
+
+
+def stream_tiles_to_response(model, request, names, eager=1):
+    """Render tiles to streaming response considering redirect flag.
+
+    ``model``
+        application model aka context
+
+    ``request``
+        the current request
+
+    ``names``
+        iterable of tile names. An item may also be a ``(name, model)`` tuple
+        for rendering the tile on another model
+
+    ``eager``
+        number of leading tiles rendered before the response gets created.
+        If a redirect is triggered while rendering these tiles, a HTTPFound
+        instance is returned. Remaining tiles are rendered lazily while the
+        response body gets iterated. A redirect triggered by these tiles
+        aborts rendering. Defaults to 1.
+
+    Lazily rendered tiles run after finished callbacks and tweens, i.e. after
+    ``pyramid_tm`` committed the transaction and database sessions have been
+    closed. Tiles depending on such data must be rendered eagerly or get
+    their data from data providers, which are fetched for all tiles before
+    the response gets created.
+    """
+    request.environ['redirect'] = None
+    tiles = _lookup_tiles(model, request, names)
+    _prefetch_data(request, tiles)
+    head = [
+        _render_tile_bytes(factory, context, request, name, True)
+        for name, context, factory in tiles[:eager]
+    ]
+    if _redirect(kw={'request': request}):
+        redirect = request.environ['redirect']
+        if isinstance(redirect, HTTPFound):
+            return redirect
+        return HTTPFound(location=redirect)
+    response_factory = request.registry.queryUtility(
+        IResponseFactory,
+        default=Response)
+    response = response_factory(
+        app_iter=_stream_tiles(request, head, tiles[eager:]))
+    return _apply_freshness(request, response)
+
+
+MISSING_INDEX_SIZE = 1024
+"""Maximum number of missing tiles kept in tile lookup index.
+"""
+
+
+def _tile_index(registry):
+    """Return tile lookup index of registry.
+
+    The index maps ``(model provides, request provides, name)`` to tile
+    factories. Missing tiles are mapped to ``None`` respective to the lookup
+    error and error message once rendered. It gets reset whenever adapter
+    registrations change, i.e. by ``register_tile``.
+    """
+    generation = registry.adapters._generation
+    index = getattr(registry, '_cone_tile_index', None)
+    if index is None or index[0] != generation:
+        index = registry._cone_tile_index = (generation, dict(), dict())
+    return index
+
+
+def _lookup_tile(model, request, name, request_provided=None):
+    """Lookup tile factory registered for model and request by name.
+
+    Returns ``None`` if no tile found.
+    """
+    if request_provided is None:
+        request_provided = providedBy(request)
+    model_provided = providedBy(model)
+    registry = request.registry
+    index = _tile_index(registry)
+    found, missing = index[1], index[2]
+    key = (model_provided, request_provided, name)
+    factory = found.get(key)
+    if factory is not None or key in missing:
+        return factory
+    factory = registry.adapters.lookup(
+        (model_provided, request_provided),
+        ITile,
+        name=name)
+    if factory is not None:
+        found[key] = factory
+        return factory
+    # tile names might origin from request parameters, keep missing tiles
+    # index bounded
+    if len(missing) >= MISSING_INDEX_SIZE:
+        missing.clear()
+    missing[key] = None
+    return None
+
+
+def has_tile(model, request, name):
+    """Check whether tile is registered for model and request by name.
+
+    Security checks are not performed.
+    """
+    return _lookup_tile(model, request, name) is not None
+
+
+def _call_tile(factory, model, request, name, allow_async=False):
+    """Call tile factory. Raises ``ComponentLookupError`` like
+    ``getMultiAdapter`` if no factory given or factory returns ``None``.
+
+    Raises ``RuntimeError`` if tile renders asynchronously unless
+    ``allow_async`` is set.
+    """
+    if factory is not None:
+        result = factory(model, request)
+        if result is not None:
+            if not allow_async and _awaitable(result):
+                if inspect.iscoroutine(result):
+                    result.close()
+                raise RuntimeError((
+                    'Tile ``{}`` renders asynchronously. Use '
+                    '``render_tile_async`` instead.'
+                ).format(name))
+            return result
+    raise ComponentLookupError((model, request), ITile, name)
+
+
+def _tile_not_found(request, name, error):
+    """Create error message for tile lookup error.
+    """
+    _log_tile_not_found(request, error)
+    err_msg = str(error).decode('utf-8') if IS_PY2 else str(error)
+    return u"Tile with name '{}' not found:<br /><pre>{}</pre>".format(
+        name, html.escape(err_msg))
+
+
+def _log_tile_not_found(request, error):
+    settings = request.registry.settings
+    if settings.get('debug_authorization', False):
+        msg = u"Error in rendering_tile: {}".format(str(error))
+        logger = request.registry.getUtility(IDebugLogger)
+        logger.debug(msg)
+
+
+def _missing_tile(model, request, name):
+    """Create error message for missing tile. The lookup error refers to
+    the interfaces provided by model and request, thus the message is kept
+    in the missing tiles index and missing tiles are rendered without
+    creating it again.
+    """
+    model_provided = providedBy(model)
+    request_provided = providedBy(request)
+    key = (model_provided, request_provided, name)
+    missing = _tile_index(request.registry)[2]
+    entry = missing.get(key)
+    if entry is None:
+        error = ComponentLookupError(
+            (model_provided, request_provided),
+            ITile,
+            name)
+        entry = (error, _tile_not_found(request, name, error))
+        if key in missing:
+            missing[key] = entry
+        return entry[1]
+    _log_tile_not_found(request, entry[0])
+    return entry[1]
 
 
 def render_tile(model, request, name, catch_errors=True):
@@ -142,33 +486,289 @@ def render_tile(model, request, name, catch_errors=True):
         if set to False, ComponentLookupError will be propagated, otherwise it
         will be catched and the error message will be returned as the result
     """
-    if not catch_errors:
-        return request.registry.getMultiAdapter(
-            (model, request),
-            ITile,
-            name=name)
+    factory = _lookup_tile(model, request, name)
+    return _render_tile(factory, model, request, name, catch_errors)
+
+
+def _lookup_tiles(model, request, names):
+    """Lookup tile factories for ``render_tiles``. Returns list of
+    ``(name, model, factory)`` tuples.
+    """
+    request_provided = providedBy(request)
+    tiles = list()
+    for item in names:
+        if isinstance(item, tuple):
+            name, context = item
+        else:
+            name, context = item, model
+        factory = _lookup_tile(context, request, name, request_provided)
+        tiles.append((name, context, factory))
+    return tiles
+
+
+def _prefetch_data(request, tiles, deferred=True):
+    """Fetch data of data providers used by tiles at once. Tiles not
+    permitted are skipped. Deferred tiles are skipped unless ``deferred`` is
+    set.
+    """
+    requirements = list()
+    for name, context, factory in tiles:
+        providers = getattr(factory, '__providers__', None)
+        if not providers:
+            continue
+        if not deferred and getattr(factory, '__defer__', None):
+            continue
+        permitted = getattr(factory, '__permitted__', None)
+        if permitted is not None and not permitted(context, request):
+            continue
+        requirements.extend([(provider, context) for provider in providers])
+    if requirements:
+        fetch_data(request, requirements)
+
+
+def prefetch_data(model, request, names):
+    """Fetch data of data providers used by tiles at once.
+
+    Intended to be called by layouts rendering tiles via templates before
+    rendering. ``render_tiles``, ``render_tiles_async`` and
+    ``stream_tiles_to_response`` prefetch data automatically.
+
+    ``model``
+        application model aka context
+
+    ``request``
+        the current request
+
+    ``names``
+        iterable of tile names. An item may also be a ``(name, model)`` tuple
+        for a tile rendered on another model
+    """
+    _prefetch_data(request, _lookup_tiles(model, request, names), False)
+
+
+def _render_tile(factory, model, request, name, catch_errors):
+    """Call tile factory considering ``catch_errors``. Records tile timing
+    if profiling is enabled.
+
+    Returns an empty string without calling the tile if a redirect has been
+    triggered.
+    """
+    if request.environ.get('redirect'):
+        return u''
+    if factory is None:
+        if not catch_errors:
+            raise ComponentLookupError((model, request), ITile, name)
+        return _missing_tile(model, request, name)
+    profile = get_profile(request)
+    if profile is not None:
+        profile.enter(name)
     try:
-        return request.registry.getMultiAdapter(
-            (model, request),
-            ITile,
-            name=name)
+        if not catch_errors:
+            return _call_tile(factory, model, request, name)
+        try:
+            return _call_tile(factory, model, request, name)
+        except ComponentLookupError as e:
+            # XXX: ComponentLookupError appears even if another error causes
+            #      tile __call__ to fail.
+            return _tile_not_found(request, name, e)
+    finally:
+        if profile is not None:
+            timing = profile.exit()
+            request.registry.notify(TileRendered(request, timing))
+
+
+_rendering = threading.local()
+
+
+def _abandoned():
+    """Check whether rendering in current thread has been abandoned, i.e.
+    because the time budget of the rendered tile has been exceeded. Redirects
+    and memoized output of abandoned renderings are dropped.
+    """
+    for abandoned in getattr(_rendering, 'abandoned', ()):
+        if abandoned.is_set():
+            return True
+    return False
+
+
+def _call_threaded(request, abandoned, func, *args):
+    """Call function in worker thread. Pushes request and registry to
+    pyramid thread locals while calling.
+
+    ``abandoned`` is a tuple of ``threading.Event`` instances. The call is
+    considered abandoned once any of them is set, see ``_abandoned``.
+    """
+    manager.push({'request': request, 'registry': request.registry})
+    previous = getattr(_rendering, 'abandoned', ())
+    _rendering.abandoned = abandoned
+    try:
+        return func(*args)
+    finally:
+        _rendering.abandoned = previous
+        manager.pop()
+
+
+def _cached_tile_bytes(factory, model, request, encoding=None):
+    """Return cached pre-encoded output of tile if permitted, otherwise
+    ``None``. ``encoding`` is either ``None`` for UTF-8 or ``gzip``.
+    """
+    cached_bytes = getattr(factory, '__cached_bytes__', None)
+    if cached_bytes is None:
+        return None
+    permitted = getattr(factory, '__permitted__', None)
+    if permitted is not None and not permitted(model, request):
+        return None
+    return cached_bytes(model, request, encoding)
+
+
+def _render_tile_bytes(factory, model, request, name, catch_errors):
+    """Render tile as UTF-8 encoded bytes. Pre-encoded output of cached tiles
+    is used without rendering and encoding the tile.
+    """
+    if request.environ.get('redirect'):
+        return b''
+    result = _cached_tile_bytes(factory, model, request)
+    if result is not None:
+        return result
+    return _render_tile(factory, model, request, name, catch_errors).encode(
+        'utf-8')
+
+
+def render_tiles(model, request, names, catch_errors=True, executor=None):
+    """Render multiple tiles.
+
+    Tile factories for all tiles are looked up first, then the tiles get
+    rendered in given order. Effective principals, permission checks and
+    template renderers are shared between the tiles.
+
+    ``model``
+        application model aka context
+
+    ``request``
+        the current request
+
+    ``names``
+        iterable of tile names. An item may also be a ``(name, model)`` tuple
+        for rendering the tile on another model
+
+    ``catch_errors``
+        see ``render_tile``
+
+    ``executor``
+        optional ``concurrent.futures.Executor``. If given, tiles registered
+        as ``independent`` are rendered concurrently by the executor while
+        the remaining tiles are rendered in the calling thread. If a redirect
+        has been triggered by any tile, all rendered tiles are empty strings
+
+    Data of data providers used by the tiles is fetched at once before
+    rendering. Returns a dict containing the rendered tiles in given order.
+    Rendered tiles are keyed by given item, i.e. by name respective by
+    ``(name, model)`` tuple.
+    """
+    names = list(names)
+    tiles = _lookup_tiles(model, request, names)
+    _prefetch_data(request, tiles)
+    futures = dict()
+    if executor is not None:
+        for index, (name, context, factory) in enumerate(tiles):
+            if getattr(factory, '__independent__', False):
+                futures[index] = executor.submit(
+                    _call_threaded,
+                    request,
+                    getattr(_rendering, 'abandoned', ()),
+                    _render_tile,
+                    factory,
+                    context,
+                    request,
+                    name,
+                    catch_errors)
+    results = list()
+    for index, (name, context, factory) in enumerate(tiles):
+        if index in futures:
+            results.append(None)
+            continue
+        results.append(_render_tile(
+            factory,
+            context,
+            request,
+            name,
+            catch_errors))
+    if not futures:
+        return _rendered_tiles(names, results)
+    for index, future in futures.items():
+        results[index] = future.result()
+    if request.environ.get('redirect'):
+        results = [u''] * len(results)
+    return _rendered_tiles(names, results)
+
+
+def _rendered_tiles(names, results):
+    """Return dict containing rendered tiles by item of ``names``.
+    """
+    return dict(zip(names, results))
+
+
+async def _render_tile_async(factory, model, request, name, catch_errors):
+    """Call tile factory and await result if necessary considering
+    ``catch_errors``.
+    """
+    if request.environ.get('redirect'):
+        return u''
+    if factory is None and catch_errors:
+        return _missing_tile(model, request, name)
+    # tiles with time budget return an awaitable instead of blocking
+    _rendering.asynchronous = getattr(factory, '__timeout__', None) is not None
+    try:
+        result = _call_tile(factory, model, request, name, allow_async=True)
     except ComponentLookupError as e:
-        # XXX: ComponentLookupError appears even if another error causes tile
-        #      __call__ to fail.
-        settings = request.registry.settings
-        if settings.get('debug_authorization', False):
-            msg = u"Error in rendering_tile: {}".format(str(e))
-            logger = request.registry.getUtility(IDebugLogger)
-            logger.debug(msg)
-        err_msg = str(e).decode('utf-8') if IS_PY2 else str(e)
-        return u"Tile with name '{}' not found:<br /><pre>{}</pre>".format(
-            name, html.escape(err_msg))
+        if not catch_errors:
+            raise
+        return _tile_not_found(request, name, e)
+    finally:
+        _rendering.asynchronous = False
+    if _awaitable(result):
+        result = await result
+    return result
+
+
+async def render_tile_async(model, request, name, catch_errors=True):
+    """Render a tile asynchronously.
+
+    Tiles may define ``prepare`` and their render function as coroutine
+    functions. Synchronous tiles are rendered directly. See ``render_tile``
+    for parameters.
+    """
+    factory = _lookup_tile(model, request, name)
+    return await _render_tile_async(factory, model, request, name, catch_errors)
+
+
+async def render_tiles_async(model, request, names, catch_errors=True):
+    """Render multiple tiles asynchronously.
+
+    Asynchronous tiles are awaited concurrently. See ``render_tiles`` for
+    parameters. If a redirect has been triggered by any tile, all rendered
+    tiles are empty strings.
+
+    Returns a dict containing the rendered tiles by given item in given
+    order.
+    """
+    names = list(names)
+    tiles = _lookup_tiles(model, request, names)
+    _prefetch_data(request, tiles)
+    results = await asyncio.gather(*[
+        _render_tile_async(factory, context, request, name, catch_errors)
+        for name, context, factory in tiles
+    ])
+    if request.environ.get('redirect'):
+        results = [u''] * len(results)
+    return _rendered_tiles(names, results)
 
 
 class TileRenderer(object):
     """Render a tile.
 
-    Intended usage is as instance in template code.
+    Intended usage is as instance in template code. Renders a placeholder
+    instead of the tile if tile was registered as deferred.
     """
 
     def __init__(self, model, request):
@@ -176,7 +776,16 @@ class TileRenderer(object):
         self.request = request
 
     def __call__(self, name):
-        return render_tile(self.model, self.request, name)
+        model = self.model
+        request = self.request
+        factory = _lookup_tile(model, request, name)
+        defer = getattr(factory, '__defer__', None)
+        if defer:
+            permitted = getattr(factory, '__permitted__', None)
+            if permitted is not None and not permitted(model, request):
+                return u''
+            return _deferred_placeholder(model, request, name, defer)
+        return _render_tile(factory, model, request, name, True)
 
 
 @implementer(ITile)
@@ -216,7 +825,10 @@ class Tile(object):
     def __call__(self, model, request):
         """Render tile.
 
+        * Return empty string if redirection has been triggered before
         * Calls ``prepare`` function
+        * Return empty string if redirection has been triggered by
+          ``prepare``
         * Check ``show`` flag and returns empty string if ``True``
         * Check template ``path`` and renders template with tile as context
           if set
@@ -226,14 +838,26 @@ class Tile(object):
           processing and return empty string if so, otherwide return rendered
           result.
 
+        If ``prepare`` or the render function are coroutine functions, a
+        coroutine is returned which must be awaited to get the rendered
+        result. See ``render_tile_async``.
+
         @param model: tile related model
         @param request: pyramid request
         @return string: rendered result
         """
         self.model = model
         self.request = request
-        self.prepare()
-        if not self.show:
+        if request.environ.get('redirect'):
+            return u''
+        profile = get_profile(request)
+        if profile is not None:
+            prepared = profile.timed('prepare', self.prepare)
+        else:
+            prepared = self.prepare()
+        if _awaitable(prepared):
+            return self._call_async(prepared)
+        if request.environ.get('redirect') or not self.show:
             return u''
         if self.path:
             result = render_template(
@@ -244,10 +868,41 @@ class Tile(object):
         else:
             renderer = getattr(self, self.attribute)
             result = renderer()
+            if _awaitable(result):
+                return self._render_async(result)
         if request.environ.get('redirect'):
             return u''
         return result
 
+    async def _call_async(self, prepared):
+        """Finish rendering of tile with asynchronous ``prepare``.
+        """
+        await prepared
+        if self.request.environ.get('redirect') or not self.show:
+            return u''
+        if self.path:
+            result = render_template(
+                self.path,
+                request=self.request,
+                model=self.model,
+                context=self)
+        else:
+            renderer = getattr(self, self.attribute)
+            result = renderer()
+            if _awaitable(result):
+                result = await result
+        if self.request.environ.get('redirect'):
+            return u''
+        return result
+
+    async def _render_async(self, rendering):
+        """Finish rendering of tile with asynchronous render function.
+        """
+        result = await rendering
+        if self.request.environ.get('redirect'):
+            return u''
+        return result
+
     @property
     def show(self):
         """Flag whether this tile should be displayed. Defaults to ``True``
@@ -273,20 +928,174 @@ class Tile(object):
 
         A tile is not always rendered to the response, form tiles i.e.
         might perform redirection.
+
+        Redirects of tiles which exceeded their time budget are ignored.
         """
+        if _abandoned():
+            return
         self.request.environ['redirect'] = redirect
+        invalidate_tile_memo(self.request)
 
     @property
     def nodeurl(self):
-        """XXX: move out from here
+        """URL of ``self.model``. Memoized for the lifetime of the request.
+        """
+        return node_url(self.model, self.request)
+
+    def provided_data(self, name):
+        """Data of data provider by name for ``self.model``. Returns
+        prefetched data if present, otherwise the data gets fetched.
+        """
+        return get_data(self.model, self.request, name)
+
+    def child_urls(self, children):
+        """URLs of given children of ``self.model``.
         """
-        # XXX: see cone.app.browser.utils, not imported in order not to
-        # depend on it, as this is supposed to move anyway
-        rp = [p for p in self.model.path if p is not None]
-        # XXX: replacing with '__s_l_a_s_h__' is a total hack, will be removed
-        #      once cone.ugm is ported, which depends on this foo
-        rp = [quote(p.replace('/', '__s_l_a_s_h__')) for p in rp]
-        return '/'.join([self.request.application_url] + rp)
+        return child_urls(self.model, self.request, children)
+
+
+NODE_URL_KEY = 'cone.tile.nodeurl'
+
+
+def _quote_name(name):
+    # XXX: replacing with '__s_l_a_s_h__' is a total hack, will be removed
+    #      once cone.ugm is ported, which depends on this foo
+    return quote(name.replace('/', '__s_l_a_s_h__'))
+
+
+def _node_url_memo(request):
+    """Return request scoped node URL memo.
+    """
+    memo = request.environ.get(NODE_URL_KEY)
+    if memo is None:
+        memo = request.environ[NODE_URL_KEY] = dict()
+    return memo
+
+
+def invalidate_node_urls(request):
+    """Invalidate memoized node URLs of request.
+
+    Memoized URLs of moved or renamed models are recreated anyway, thus this
+    is only needed for releasing memoized URLs.
+    """
+    request.environ.pop(NODE_URL_KEY, None)
+
+
+def node_url(model, request):
+    """Create URL of model. URLs are memoized by model and application URL
+    for the lifetime of the request. Memoized URLs are only used as long as
+    the path of the model did not change.
+
+    ``model.path`` is read on every call in order to validate the memoized
+    URL, which is O(depth) for models computing their path from lineage.
+    Memoization saves quoting and joining of path segments only.
+    """
+    return _node_url(model, request, tuple(model.path))
+
+
+def _node_url(model, request, path):
+    # XXX: see cone.app.browser.utils, not imported in order not to
+    # depend on it, as this is supposed to move anyway
+    application_url = request.application_url
+    memo = _node_url_memo(request)
+    key = (id(model), application_url)
+    entry = memo.get(key)
+    # model is kept in memo entry to prevent reuse of its id
+    if entry is not None and entry[0] is model and entry[1] == path:
+        return entry[2]
+    rp = [_quote_name(p) for p in path if p is not None]
+    url = '/'.join([application_url] + rp)
+    memo[key] = (model, path, url)
+    return url
+
+
+def child_urls(model, request, children):
+    """Create URLs of children of model at once. Returns list of URLs in
+    order of given children.
+
+    The path and URL of model are computed once and the URL is used as
+    prefix for all children. ``path`` of children is not read, thus for each
+    child only its name gets quoted and appended. Created URLs are memoized
+    like by ``node_url``.
+    """
+    application_url = request.application_url
+    memo = _node_url_memo(request)
+    path = tuple(model.path)
+    prefix = _node_url(model, request, path)
+    urls = list()
+    for child in children:
+        name = child.__name__
+        child_path = path + (name,)
+        key = (id(child), application_url)
+        entry = memo.get(key)
+        if entry is not None and entry[0] is child and \
+                entry[1] == child_path:
+            urls.append(entry[2])
+            continue
+        url = prefix if name is None else '/'.join([prefix, _quote_name(name)])
+        memo[key] = (child, child_path, url)
+        urls.append(url)
+    return urls
+
+
+DEFERRED_TILE_VIEW = 'deferred_tile'
+"""Name of the view rendering deferred tiles.
+"""
+
+
+def deferred_tile_url(model, request, name):
+    """Create URL of the view rendering the deferred tile by name on model.
+    """
+    return '{}/{}?{}'.format(
+        node_url(model, request),
+        DEFERRED_TILE_VIEW,
+        urlencode({'name': name}))
+
+
+def _deferred_placeholder(model, request, name, defer):
+    """Create placeholder for deferred tile.
+    """
+    url = html.escape(deferred_tile_url(model, request, name))
+    if defer == 'esi':
+        return u'<esi:include src="{}" />'.format(url)
+    return (
+        u'<div class="deferred-tile" data-tile="{}" data-tile-url="{}">'
+        u'</div>'
+    ).format(html.escape(name), url)
+
+
+SECURITY_CACHE_KEY = 'cone.tile.security'
+
+
+def _security_cache(request):
+    """Return request scoped security cache.
+    """
+    cache = request.environ.get(SECURITY_CACHE_KEY)
+    if cache is None:
+        cache = request.environ[SECURITY_CACHE_KEY] = dict()
+    return cache
+
+
+def invalidate_security_cache(request):
+    """Invalidate cached effective principals and permission check results
+    of request.
+
+    Must be called by tiles changing the authentication state while
+    rendering, i.e. login and logout forms.
+    """
+    request.environ.pop(SECURITY_CACHE_KEY, None)
+
+
+def effective_principals(request, authn_policy):
+    """Return effective principals of request. Principals get cached for
+    the lifetime of the request.
+    """
+    cache = _security_cache(request)
+    key = ('principals', authn_policy)
+    principals = cache.get(key)
+    if principals is None:
+        principals = cache[key] = authn_policy.effective_principals(request)
+    return principals
 
 
 def _secure_tile(tile, permission, authn_policy, authz_policy, strict):
@@ -295,17 +1104,30 @@ def _secure_tile(tile, permission, authn_policy, authz_policy, strict):
     wrapped_tile = tile
     if authn_policy and authz_policy and (permission is not None):
         def _permitted(context, request):
-            principals = authn_policy.effective_principals(request)
-            return authz_policy.permits(context, principals, permission)
+            cache = _security_cache(request)
+            key = ('permits', id(context), authz_policy, permission)
+            cached = cache.get(key)
+            # context is kept in cache value to prevent reuse of its id
+            if cached is not None and cached[0] is context:
+                return cached[1]
+            principals = effective_principals(request, authn_policy)
+            result = authz_policy.permits(context, principals, permission)
+            cache[key] = (context, result)
+            return result
 
         def _secured_tile(context, request):
-            result = _permitted(context, request)
+            profile = get_profile(request)
+            if profile is not None:
+                result = profile.timed('security', _permitted, context, request)
+            else:
+                result = _permitted(context, request)
             if result:
                 return tile(context, request)
             msg = getattr(
                 request,
                 'authdebug_message',
-                'Unauthorized: tile {} failed permission check'.format(tile)
+                'Unauthorized: tile {} failed permission check'.format(
+                    getattr(tile, '__original_view__', tile))
             )
             if strict:
                 raise HTTPForbidden(msg, result=result)
@@ -322,9 +1144,264 @@ def _secure_tile(tile, permission, authn_policy, authz_policy, strict):
     return wrapped_tile
 
 
+def _bind_tile(tile):
+    """wraps tile and renders a dedicated copy of it per call.
+
+    The registered tile acts as prototype. Calling the tile binds ``model``
+    and ``request`` to it, thus rendering the prototype directly is not
+    thread safe. Tiles not based on ``Tile``, e.g. functions returning the
+    tile callable, are registered as is.
+    """
+    if not isinstance(tile, Tile):
+        return tile
+    state = tile.__dict__
+    class_ = tile.__class__
+
+    def _bound_tile(context, request):
+        bound = class_.__new__(class_)
+        bound.__dict__.update(state)
+        return bound(context, request)
+    preserve_view_attrs(tile, _bound_tile)
+    return _bound_tile
+
+
+def _cache_tile(tile, cache):
+    """wraps tile and caches rendered output as defined by cache policy.
+    """
+    name = getattr(tile, '__original_view__', tile).name
+
+    def _cached_tile(context, request):
+        backend = cache.cache(request)
+        key = cache.key(context, request, name)
+        result = backend.get(key)
+        if result is not None:
+            return result.decode('utf-8') if cache.encode else result
+        result = tile(context, request)
+        if _awaitable(result):
+            return _cache_async(result, request, backend, key)
+        _cache(result, request, backend, key)
+        return result
+
+    async def _cache_async(rendering, request, backend, key):
+        result = await rendering
+        _cache(result, request, backend, key)
+        return result
+
+    def _cache(result, request, backend, key):
+        if result is None or request.environ.get('redirect'):
+            return
+        if not cache.encode:
+            backend.set(key, result, ttl=cache.ttl)
+            return
+        encoded = result.encode('utf-8')
+        backend.set(key, encoded, ttl=cache.ttl)
+        if cache.compress:
+            backend.set(
+                key + ('gzip',),
+                gzip.compress(encoded, mtime=0),
+                ttl=cache.ttl)
+
+    def _cached_bytes(context, request, encoding=None):
+        backend = cache.cache(request)
+        key = cache.key(context, request, name)
+        if encoding == 'gzip':
+            key += ('gzip',)
+        return backend.get(key)
+    _cached_tile.__cache__ = cache
+    if cache.encode:
+        _cached_tile.__cached_bytes__ = _cached_bytes
+    preserve_view_attrs(tile, _cached_tile)
+    return _cached_tile
+
+
+MEMO_KEY = 'cone.tile.memo'
+
+
+def invalidate_tile_memo(request, model=None):
+    """Invalidate memoized tile output and fetched data of request.
+
+    If ``model`` is given, only output rendered and data fetched for this
+    model gets invalidated. Must be called by tiles changing the model while
+    rendering.
+    """
+    for memo_key in (MEMO_KEY, DATA_KEY):
+        if model is None:
+            request.environ.pop(memo_key, None)
+            continue
+        memo = request.environ.get(memo_key)
+        if memo:
+            for key in [key for key in memo if key[1] == id(model)]:
+                del memo[key]
+
+
+def _memoize_tile(tile, freshness):
+    """wraps tile and memoizes rendered output for the lifetime of the
+    request.
+
+    If ``freshness`` is given, memoized output is only used as long as the
+    freshness token of the model did not change.
+    """
+    name = getattr(tile, '__original_view__', tile).name
+
+    def _memoized_tile(context, request):
+        key = (name, id(context))
+        token = freshness(context, request) if freshness is not None else None
+        memo = request.environ.get(MEMO_KEY)
+        entry = memo.get(key) if memo else None
+        # context is kept in memo entry to prevent reuse of its id
+        if entry is not None and entry[0] is context and entry[1] == token:
+            return entry[2]
+        result = tile(context, request)
+        if _awaitable(result):
+            return _memoize_async(result, context, request, key, token)
+        _memoize(result, context, request, key, token)
+        return result
+
+    async def _memoize_async(rendering, context, request, key, token):
+        result = await rendering
+        _memoize(result, context, request, key, token)
+        return result
+
+    def _memoize(result, context, request, key, token):
+        # output of renderings exceeding time budget is discarded
+        if result is None or request.environ.get('redirect') or _abandoned():
+            return
+        memo = request.environ.get(MEMO_KEY)
+        if memo is None:
+            memo = request.environ[MEMO_KEY] = dict()
+        memo[key] = (context, token, result)
+    preserve_view_attrs(tile, _memoized_tile)
+    return _memoized_tile
+
+
+TIMEOUT_KEY = 'cone.tile.timeout'
+"""Time budgets of tiles are ignored if set to ``False`` in request environ.
+"""
+
+TIMEOUT_WORKERS = 8
+"""Default number of worker threads rendering tiles with time budget.
+Configurable via ``cone.tile.timeout_workers`` setting.
+"""
+
+_timeout_executor = None
+_timeout_executor_lock = threading.Lock()
+
+
+def _get_timeout_executor(registry):
+    """Return executor rendering tiles with time budget. The executor is
+    shared process wide and created on first use.
+    """
+    global _timeout_executor
+    if _timeout_executor is None:
+        with _timeout_executor_lock:
+            if _timeout_executor is None:
+                settings = registry.settings or {}
+                workers = int(settings.get(
+                    'cone.tile.timeout_workers',
+                    TIMEOUT_WORKERS))
+                _timeout_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix='cone.tile.timeout')
+    return _timeout_executor
+
+
+def _timeout_fallback(model, request, name, timeout, fallback):
+    """Log exceeded time budget and create fallback content.
+    """
+    logger = request.registry.queryUtility(IDebugLogger)
+    if logger is not None:
+        logger.debug((
+            u"Tile '{}' exceeded time budget of {} seconds. "
+            u"Render fallback."
+        ).format(name, timeout))
+    if fallback is None:
+        return u''
+    if fallback in ('ajax', 'esi'):
+        return _deferred_placeholder(model, request, name, fallback)
+    if callable(fallback):
+        return fallback(model, request)
+    return fallback
+
+
+def _timeout_tile(tile, timeout, fallback):
+    """wraps tile and renders it in worker thread with time budget.
+
+    If the time budget is exceeded, fallback content is returned. Rendering
+    not started yet gets cancelled. A running worker thread cannot be
+    interrupted and finishes rendering in background, its result is
+    discarded. Redirects and memoized output of the abandoned rendering are
+    dropped, while security checks and fetched data may still be cached on
+    the request.
+
+    When rendered by ``render_tile_async`` respective
+    ``render_tiles_async``, an awaitable is returned, thus the event loop is
+    not blocked while waiting for the worker thread.
+    """
+    name = getattr(tile, '__original_view__', tile).name
+
+    def _timed_tile(context, request):
+        asynchronous = getattr(_rendering, 'asynchronous', False)
+        _rendering.asynchronous = False
+        if request.environ.get(TIMEOUT_KEY) is False:
+            return tile(context, request)
+        abandoned = threading.Event()
+        if asynchronous:
+            return _timed_async(context, request, abandoned)
+        start = time.monotonic()
+        future = _get_timeout_executor(request.registry).submit(
+            *_timed_call(tile, context, request, abandoned))
+        try:
+            result = future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            # prevent rendering after request has been finished if queued
+            future.cancel()
+            abandoned.set()
+            return _timeout_fallback(context, request, name, timeout, fallback)
+        if _awaitable(result):
+            remaining = max(timeout - (time.monotonic() - start), 0)
+            return _timeout_async(result, context, request, remaining)
+        return result
+
+    async def _timed_async(context, request, abandoned):
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        rendering = loop.run_in_executor(
+            _get_timeout_executor(request.registry),
+            *_timed_call(tile, context, request, abandoned))
+        try:
+            # cancels rendering if still queued
+            result = await asyncio.wait_for(rendering, timeout)
+        except asyncio.TimeoutError:
+            abandoned.set()
+            return _timeout_fallback(context, request, name, timeout, fallback)
+        if _awaitable(result):
+            remaining = max(timeout - (time.monotonic() - start), 0)
+            return await _timeout_async(result, context, request, remaining)
+        return result
+
+    async def _timeout_async(rendering, context, request, remaining):
+        try:
+            return await asyncio.wait_for(rendering, remaining)
+        except asyncio.TimeoutError:
+            return _timeout_fallback(context, request, name, timeout, fallback)
+    preserve_view_attrs(tile, _timed_tile)
+    return _timed_tile
+
+
+def _timed_call(tile, context, request, abandoned):
+    """Return arguments for calling tile with time budget in worker thread.
+    Renderings abandoned by calling thread are abandoned as well.
+    """
+    abandoned = getattr(_rendering, 'abandoned', ()) + (abandoned,)
+    return (_call_threaded, request, abandoned, tile, context, request)
+
+
 # Registration
 def register_tile(name=None, path=None, attribute=None, interface=Interface,
-                  class_=Tile, permission='view', strict=True, _level=2):
+                  class_=Tile, permission='view', strict=True, cache=None,
+                  independent=False, freshness=None, defer=None,
+                  memoize=False, providers=(), timeout=None, fallback=None,
+                  _level=2):
     """Registers a tile.
 
     ``name``
@@ -356,10 +1433,118 @@ def register_tile(name=None, path=None, attribute=None, interface=Interface,
         ``False`` the exception is consumed and an empty unicode string is
         returned.
 
+    ``cache``
+        ``cone.tile.CachePolicy`` instance. If given, rendered output of the
+        tile gets cached as defined by policy. Security checks are performed
+        regardless of cached output. Defaults to ``None``.
+
+    ``independent``
+        Flag whether the tile does not depend on other tiles rendered in the
+        same request. Independent tiles are rendered concurrently by
+        ``render_tiles`` if an executor is given. Defaults to ``False``.
+
+    ``freshness``
+        Callable accepting ``model`` and ``request``, cheaply returning the
+        version or the modification date of the tile content, or ``None`` if
+        unknown. Used by ``check_freshness``. Defaults to ``None``.
+
+    ``defer``
+        Render a placeholder instead of the tile inside templates. The tile
+        itself gets rendered by the ``deferred_tile`` view. If ``esi``, an
+        edge side include tag is rendered. If ``True`` or ``ajax``, a div
+        containing the tile URL in ``data-tile-url`` attribute is rendered.
+        Defaults to ``None``.
+
+    ``memoize``
+        Flag whether rendered output of the tile gets memoized for the
+        lifetime of the request by model and tile name. Repeated rendering of
+        the tile on the same model returns the memoized output. Defaults to
+        ``False``.
+
+    ``providers``
+        Names of data providers the tile uses. Data of these providers gets
+        fetched at once for all tiles rendered by ``render_tiles`` or
+        ``prefetch_data``. Defaults to ``()``.
+
+    ``timeout``
+        Time budget for rendering the tile in seconds. If given, the tile
+        gets rendered in a worker thread. If rendering exceeds the time
+        budget, ``fallback`` is rendered instead and the overrun gets logged.
+        Defaults to ``None``.
+
+    ``fallback``
+        Content rendered if the time budget of the tile is exceeded. Either a
+        string, a callable accepting ``model`` and ``request``, or ``ajax``
+        or ``esi`` for rendering a deferred tile placeholder. Defaults to
+        ``None``, which renders an empty string.
+
     ``_level``
         is a bit special to make doctests pass the magic path-detection.
         you must never touch it in application code.
     """
+    if path and not (':' in path or os.path.isabs(path)):
+        path = '{}:{}'.format(caller_package(_level).__name__, path)
+    registry = get_current_registry()
+    _register_tile(
+        registry,
+        registry.getUtility(IDebugLogger),
+        registry.queryUtility(IAuthenticationPolicy),
+        registry.queryUtility(IAuthorizationPolicy),
+        name=name,
+        path=path,
+        attribute=attribute,
+        interface=interface,
+        class_=class_,
+        permission=permission,
+        strict=strict,
+        cache=cache,
+        independent=independent,
+        freshness=freshness,
+        defer=defer,
+        memoize=memoize,
+        providers=providers,
+        timeout=timeout,
+        fallback=fallback)
+
+
+def register_tiles(registrations, registry=None):
+    """Registers multiple tiles at once.
+
+    ``registrations``
+        Iterable of dicts containing keyword arguments for ``register_tile``.
+        Relative template paths are resolved against the package of the
+        caller.
+
+    ``registry``
+        Registry to register the tiles in. Defaults to current registry.
+
+    Registry utilities used for registration are looked up only once. Tiles
+    are still registered as adapters one by one.
+    """
+    if registry is None:
+        registry = get_current_registry()
+    logger = registry.getUtility(IDebugLogger)
+    authn_policy = registry.queryUtility(IAuthenticationPolicy)
+    authz_policy = registry.queryUtility(IAuthorizationPolicy)
+    package = None
+    for kw in registrations:
+        path = kw.get('path')
+        if path and not (':' in path or os.path.isabs(path)):
+            if package is None:
+                package = caller_package(2).__name__
+            kw = dict(kw)
+            kw['path'] = '{}:{}'.format(package, path)
+        _register_tile(registry, logger, authn_policy, authz_policy, **kw)
+
+
+def _register_tile(registry, logger, authn_policy, authz_policy, name=None,
+                   path=None, attribute=None, interface=Interface,
+                   class_=Tile, permission='view', strict=True, cache=None,
+                   independent=False, freshness=None, defer=None,
+                   memoize=False, providers=(), timeout=None,
+                   fallback=None):
+    """Register tile in registry. ``path`` is expected to be absolute.
+    """
     if name is None:
         name = class_.name
     if name is None:
@@ -367,16 +1552,22 @@ def register_tile(name=None, path=None, attribute=None, interface=Interface,
             'Tile ``name`` must be either given at registration time '
             'or set on given tile class: {}'
         ).format(str(class_)))
-    if path and not (':' in path or os.path.isabs(path)):
-        path = '{}:{}'.format(caller_package(_level).__name__, path)
-    tile = class_(path=path, attribute=attribute, name=name)
-    registry = get_current_registry()
+    if defer not in (None, False, True, 'ajax', 'esi'):
+        raise ValueError('Invalid ``defer`` value: {}'.format(defer))
+    if timeout is not None and timeout <= 0:
+        raise ValueError('Invalid ``timeout`` value: {}'.format(timeout))
+    tile = _bind_tile(class_(path=path, attribute=attribute, name=name))
+    cached_bytes = None
+    if cache is not None:
+        tile = _cache_tile(tile, cache)
+        cached_bytes = getattr(tile, '__cached_bytes__', None)
+    if memoize:
+        tile = _memoize_tile(tile, freshness)
+    if timeout is not None:
+        tile = _timeout_tile(tile, timeout, fallback)
     registered = registry.adapters.registered
     unregister = registry.adapters.unregister
-    logger = registry.getUtility(IDebugLogger)
     if permission is not None:
-        authn_policy = registry.queryUtility(IAuthenticationPolicy)
-        authz_policy = registry.queryUtility(IAuthorizationPolicy)
         tile = _secure_tile(
             tile,
             permission,
@@ -400,18 +1591,38 @@ def register_tile(name=None, path=None, attribute=None, interface=Interface,
             (IViewClassifier, IRequest, interface),
             ISecuredView,
             name)
+    if independent:
+        tile.__independent__ = True
+    if freshness is not None:
+        tile.__freshness__ = freshness
+    if defer:
+        tile.__defer__ = defer
+    if providers:
+        tile.__providers__ = tuple(providers)
+    if timeout is not None:
+        tile.__timeout__ = timeout
+        tile.__fallback__ = fallback
+    if cached_bytes is not None:
+        tile.__cached_bytes__ = cached_bytes
     exists = registered((interface, IRequest), ITile, name=name)
     if exists:
         msg = u"Unregister tile for '{}' with name '{}'".format(
             str(interface), name)
         logger.debug(msg)
         unregister((interface, IRequest), ITile, name=name)
+        for event, handler in getattr(exists, '__handlers__', ()):
+            registry.unregisterHandler(handler, (event,))
     registry.registerAdapter(
         tile,
         [interface, IRequest],
         ITile,
         name,
         event=False)
+    if cache is not None and cache.events:
+        handler = cache.handler(registry, name, interface)
+        tile.__handlers__ = [(event, handler) for event in cache.events]
+        for event in cache.events:
+            registry.registerHandler(handler, (event,), event=False)
 
 
 class tile(object):
@@ -421,7 +1632,9 @@ class tile(object):
 
     def __init__(self, name=None, path=None, attribute=None,
                  interface=Interface, permission='view',
-                 strict=True, _level=2):
+                 strict=True, cache=None, independent=False,
+                 freshness=None, defer=None, memoize=False, providers=(),
+                 timeout=None, fallback=None, _level=2):
         """See ``register_tile`` for details on the other parameters.
         """
         self.name = name
@@ -432,6 +1645,14 @@ class tile(object):
         self.interface = interface
         self.permission = permission
         self.strict = strict
+        self.cache = cache
+        self.independent = independent
+        self.freshness = freshness
+        self.defer = defer
+        self.memoize = memoize
+        self.providers = providers
+        self.timeout = timeout
+        self.fallback = fallback
 
     def __call__(self, ob):
         kw = dict(
@@ -441,10 +1662,42 @@ class tile(object):
             interface=self.interface,
             class_=ob,
             permission=self.permission,
-            strict=self.strict
+            strict=self.strict,
+            cache=self.cache,
+            independent=self.independent,
+            freshness=self.freshness,
+            defer=self.defer,
+            memoize=self.memoize,
+            providers=self.providers,
+            timeout=self.timeout,
+            fallback=self.fallback
         )
 
         def callback(context, name, ob):
-            register_tile(**kw)
+            config = getattr(context, 'config', None)
+            if config is None:
+                register_tile(**kw)
+            else:
+                _scan_registration(context, config, kw)
         self.venusian.attach(ob, callback, category='pyramid', depth=1)
         return ob
+
+
+def _scan_registration(context, config, kw):
+    """Register tile found by venusian scan. Registry utilities used for
+    registration are looked up once per scan. Tiles get registered in scan
+    order, thus tiles registered after the scan override scanned tiles.
+
+    Registration is not collected and done at the end of the scan, since
+    venusian provides no hook for it.
+    """
+    utilities = getattr(context, '_cone_tile_utilities', None)
+    if utilities is None:
+        registry = config.registry
+        utilities = context._cone_tile_utilities = (
+            registry,
+            registry.getUtility(IDebugLogger),
+            registry.queryUtility(IAuthenticationPolicy),
+            registry.queryUtility(IAuthorizationPolicy)
+        )
+    _register_tile(*utilities, **kw)
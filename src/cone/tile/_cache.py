@@ -0,0 +1,436 @@
+from cone.tile._api import effective_principals
+from collections import OrderedDict
+from pyramid.interfaces import IAuthenticationPolicy
+from pyramid.location import lineage
+from pyramid.traversal import resource_path_tuple
+from zope.interface import Interface
+from zope.interface import implementedBy
+from zope.interface import implementer
+import sys
+import threading
+import time
+
+
+class ITileCache(Interface):
+    """Storage backend for rendered tile output.
+
+    Keys are tuples of hashable and printable values as created by
+    ``CachePolicy.key``. Shared backends may serialize them as desired.
+    """
+
+    def get(key):
+        """Return cached value for key or ``None`` if not cached or expired.
+        """
+
+    def set(key, value, ttl=None):
+        """Store value for key. ``ttl`` is the lifetime in seconds, ``None``
+        means no expiration.
+        """
+
+    def delete(key):
+        """Remove value for key if present.
+        """
+
+    def clear():
+        """Remove all values.
+        """
+
+    def invalidate(name, model_key):
+        """Remove all values cached for tile name and model identity, i.e.
+        all keys starting with ``(name, model_key)``.
+        """
+
+
+class _RecentKeys(object):
+    """Keys ordered by recent use for LRU eviction.
+    """
+
+    def __init__(self):
+        self._keys = OrderedDict()
+
+    def add(self, key):
+        self._keys[key] = None
+
+    def hit(self, key):
+        self._keys.move_to_end(key)
+
+    def remove(self, key):
+        del self._keys[key]
+
+    def least(self):
+        return next(iter(self._keys))
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class _FrequentKeys(object):
+    """Keys grouped by use count for LFU eviction.
+
+    Buckets of keys with equal use count are linked in ascending order of
+    count, thus all operations are done in constant time. Within a bucket,
+    keys are ordered by the time they reached the count.
+    """
+
+    def __init__(self):
+        # key -> use count
+        self._counts = dict()
+        # use count -> OrderedDict of keys
+        self._buckets = dict()
+        # use count -> previous respective next use count
+        self._prev = dict()
+        self._next = dict()
+        self._head = None
+
+    def _link(self, count, after):
+        following = self._head if after is None else self._next[after]
+        self._buckets[count] = OrderedDict()
+        self._prev[count] = after
+        self._next[count] = following
+        if after is None:
+            self._head = count
+        else:
+            self._next[after] = count
+        if following is not None:
+            self._prev[following] = count
+
+    def _unlink(self, count):
+        prev = self._prev.pop(count)
+        following = self._next.pop(count)
+        del self._buckets[count]
+        if prev is None:
+            self._head = following
+        else:
+            self._next[prev] = following
+        if following is not None:
+            self._prev[following] = prev
+
+    def _discard(self, key, count):
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            self._unlink(count)
+
+    def add(self, key):
+        if self._head != 0:
+            self._link(0, None)
+        self._buckets[0][key] = None
+        self._counts[key] = 0
+
+    def hit(self, key):
+        count = self._counts[key]
+        if count + 1 not in self._buckets:
+            self._link(count + 1, count)
+        self._buckets[count + 1][key] = None
+        self._counts[key] = count + 1
+        self._discard(key, count)
+
+    def remove(self, key):
+        self._discard(key, self._counts.pop(key))
+
+    def least(self):
+        return next(iter(self._buckets[self._head]))
+
+    def __len__(self):
+        return len(self._counts)
+
+
+@implementer(ITileCache)
+class MemoryTileCache(object):
+    """In-process tile cache with TTL, size accounting and LRU or LFU
+    eviction.
+
+    The size of cached values is accounted by ``sys.getsizeof``. Memory
+    budgets per tile name consider the first item of cache keys as tile
+    name, which is the case for keys created by ``CachePolicy``.
+    """
+
+    def __init__(self, maxsize=1024, maxbytes=None, name_maxbytes=None,
+                 eviction='lru'):
+        """Construct memory tile cache.
+
+        @param maxsize: Maximum number of entries held in cache.
+        @param maxbytes: Maximum size of all values held in cache in bytes.
+        ``None`` means no limit.
+        @param name_maxbytes: Maximum size of values held in cache per tile
+        name in bytes. Either an integer applying to all tile names or a dict
+        containing the budgets by tile name. ``None`` means no limit.
+        @param eviction: Either ``lru`` for evicting least recently used or
+        ``lfu`` for evicting least frequently used entries.
+        """
+        if eviction not in ('lru', 'lfu'):
+            raise ValueError('Invalid ``eviction`` value: {}'.format(eviction))
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.name_maxbytes = name_maxbytes
+        self.eviction = eviction
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._keys = _RecentKeys if eviction == 'lru' else _FrequentKeys
+        # key -> [expires, value, size]
+        self._data = dict()
+        # keys in eviction order
+        self._order = self._keys()
+        # name -> [size, keys in eviction order]
+        self._names = dict()
+        # (name, model key) -> set of keys
+        self._models = dict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] is not None and entry[0] < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._order.hit(key)
+            self._names[_key_name(key)][1].hit(key)
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + ttl if ttl is not None else None
+        size = sys.getsizeof(value)
+        name = _key_name(key)
+        name_maxbytes = self._name_maxbytes(name)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            # value exceeding memory budget is not cached at all
+            if self.maxbytes is not None and size > self.maxbytes:
+                return
+            if name_maxbytes is not None and size > name_maxbytes:
+                return
+            # evict before adding, thus the added entry is never evicted
+            names = self._names.get(name)
+            while names is not None and name_maxbytes is not None and \
+                    names[0] + size > name_maxbytes:
+                self._evict(names[1].least())
+                names = self._names.get(name)
+            while len(self._data) >= self.maxsize or (
+                self.maxbytes is not None and self.size + size > self.maxbytes
+            ):
+                if not self._data:
+                    return
+                self._evict(self._order.least())
+            self._data[key] = [expires, value, size]
+            self._order.add(key)
+            names = self._names.get(name)
+            if names is None:
+                names = self._names[name] = [0, self._keys()]
+            names[0] += size
+            names[1].add(key)
+            if isinstance(key, tuple) and len(key) > 1:
+                self._models.setdefault(key[:2], set()).add(key)
+            self.size += size
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._order = self._keys()
+            self._names.clear()
+            self._models.clear()
+            self.size = 0
+
+    def invalidate(self, name, model_key):
+        with self._lock:
+            for key in list(self._models.get((name, model_key), ())):
+                self._remove(key)
+
+    def stats(self):
+        """Return cache statistics. Contains ``hits``, ``misses``,
+        ``evictions``, number of ``entries``, resident ``size`` in bytes and
+        ``names`` containing ``entries`` and ``size`` by tile name.
+        """
+        with self._lock:
+            return dict(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                entries=len(self._data),
+                size=self.size,
+                names=dict([
+                    (name, dict(entries=len(names[1]), size=names[0]))
+                    for name, names in self._names.items()
+                ])
+            )
+
+    def _name_maxbytes(self, name):
+        name_maxbytes = self.name_maxbytes
+        if isinstance(name_maxbytes, dict):
+            return name_maxbytes.get(name)
+        return name_maxbytes
+
+    def _remove(self, key):
+        size = self._data.pop(key)[2]
+        self._order.remove(key)
+        self.size -= size
+        name = _key_name(key)
+        names = self._names[name]
+        names[0] -= size
+        names[1].remove(key)
+        if not names[1]:
+            del self._names[name]
+        if isinstance(key, tuple) and len(key) > 1:
+            keys = self._models[key[:2]]
+            keys.discard(key)
+            if not keys:
+                del self._models[key[:2]]
+
+    def _evict(self, key):
+        self._remove(key)
+        self.evictions += 1
+
+    def __len__(self):
+        return len(self._data)
+
+
+def _key_name(key):
+    """Return tile name of cache key.
+    """
+    return key[0] if isinstance(key, tuple) and key else None
+
+
+default_cache = MemoryTileCache()
+"""Cache used if neither policy nor registry provide an ``ITileCache``.
+"""
+
+
+def model_key(model):
+    """Return identity of model usable across requests.
+
+    Uses ``model.path`` if present, otherwise the traversal path.
+    """
+    path = getattr(model, 'path', None)
+    if path is None:
+        return resource_path_tuple(model)
+    return tuple(path)
+
+
+def principals_key(request):
+    """Return sorted effective principals of request as tuple.
+    """
+    authn_policy = request.registry.queryUtility(IAuthenticationPolicy)
+    if authn_policy is None:
+        return ()
+    return tuple(sorted(effective_principals(request, authn_policy)))
+
+
+class CachePolicy(object):
+    """Caching policy for a tile. Passed as ``cache`` to ``tile`` decorator
+    or ``register_tile``.
+
+    Cache keys always contain the tile name and the model identity.
+    """
+
+    def __init__(self, ttl=None, principals=False, params=(), key=None,
+                 backend=None, encode=False, compress=False, events=(),
+                 ancestors=False):
+        """Construct cache policy.
+
+        @param ttl: Lifetime of cached output in seconds. ``None`` means
+        cached output never expires.
+        @param principals: Flag whether cached output varies by effective
+        principals of the current user.
+        @param params: Names of request parameters the output varies by.
+        @param key: Optional callable accepting ``model``, ``request`` and
+        ``name``, returning a hashable value added to the cache key.
+        @param backend: ``ITileCache`` implementation. If not given, an
+        ``ITileCache`` utility is looked up, falling back to an in-process
+        memory cache.
+        @param encode: Flag whether output is stored as UTF-8 encoded bytes.
+        Pre-encoded output is written to streaming responses without
+        encoding it again.
+        @param compress: Flag whether a gzip compressed variant of the
+        output is stored additionally. Implies ``encode``. Compressed output
+        is delivered as is by the ``deferred_tile`` view.
+        @param events: Interfaces of object events invalidating cached output
+        of the tile for the event object, i.e. ``IObjectModifiedEvent``. Only
+        objects providing the interface the tile is registered for are
+        considered.
+        @param ancestors: Flag whether events also invalidate cached output
+        of the tile for the ancestors of the event object.
+        """
+        self.ttl = ttl
+        self.principals = principals
+        self.params = tuple(params)
+        self.custom_key = key
+        self.backend = backend
+        self.encode = encode or compress
+        self.compress = compress
+        self.events = tuple(events)
+        self.ancestors = ancestors
+
+    def key(self, model, request, name):
+        """Create cache key for rendering tile by name on model.
+        """
+        key = (name, model_key(model))
+        if self.principals:
+            key += (principals_key(request),)
+        if self.params:
+            params = request.params
+            key += (tuple(params.get(param) for param in self.params),)
+        if self.custom_key is not None:
+            key += (self.custom_key(model, request, name),)
+        return key
+
+    def cache(self, request):
+        """Return ``ITileCache`` to use for request.
+        """
+        return self._cache(request.registry)
+
+    def _cache(self, registry):
+        if self.backend is not None:
+            return self.backend
+        return registry.queryUtility(ITileCache, default=default_cache)
+
+    def invalidate(self, registry, name, model):
+        """Remove all output of tile by name cached for model.
+        """
+        self._cache(registry).invalidate(name, model_key(model))
+
+    def handler(self, registry, name, interface):
+        """Create event handler invalidating cached output of tile by name
+        for event object. Registered for ``events`` by ``register_tile``.
+        """
+        if isinstance(interface, type):
+            interface = implementedBy(interface)
+        ancestors = self.ancestors
+
+        def invalidate(event):
+            backend = self._cache(registry)
+            for model, key in _event_targets(event, ancestors):
+                if interface.providedBy(model):
+                    backend.invalidate(name, key)
+        return invalidate
+
+
+def _event_targets(event, ancestors):
+    """Return list of ``(model, model key)`` tuples affected by object event.
+
+    Considers the former location of moved or removed objects if event
+    provides ``oldParent`` and ``oldName``.
+    """
+    model = event.object
+    targets = [(model, model_key(model))]
+    parents = list()
+    if ancestors:
+        parents.extend(lineage(getattr(model, '__parent__', None)))
+    old_parent = getattr(event, 'oldParent', None)
+    if old_parent is not None:
+        targets.append((model, model_key(old_parent) + (event.oldName,)))
+        if ancestors:
+            parents.extend(lineage(old_parent))
+    targets.extend([(parent, model_key(parent)) for parent in parents])
+    return targets
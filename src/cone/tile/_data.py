@@ -0,0 +1,83 @@
+from collections import OrderedDict
+from pyramid.threadlocal import get_current_registry
+from zope.interface import Interface
+
+
+DATA_KEY = 'cone.tile.data'
+
+
+class ITileDataProvider(Interface):
+    """Named provider of data used by tiles.
+
+    Providers fetch data for multiple models at once, thus tiles rendered on
+    a page share a single backend call per provider.
+    """
+
+    def __call__(models, request):
+        """Return data for each of given models as sequence in order of
+        models.
+        """
+
+
+def register_data_provider(name, provider, registry=None):
+    """Register data provider.
+
+    ``name``
+        Name of the data provider. Tiles refer to the provider by this name.
+
+    ``provider``
+        Callable accepting list of ``models`` and ``request``, returning the
+        data for each model in order of models.
+
+    ``registry``
+        Registry to register the provider in. Defaults to current registry.
+    """
+    if registry is None:
+        registry = get_current_registry()
+    registry.registerUtility(provider, ITileDataProvider, name=name)
+
+
+def _data_memo(request):
+    """Return request scoped memo of fetched data.
+    """
+    memo = request.environ.get(DATA_KEY)
+    if memo is None:
+        memo = request.environ[DATA_KEY] = dict()
+    return memo
+
+
+def fetch_data(request, requirements):
+    """Fetch data for multiple models at once.
+
+    ``requirements`` is an iterable of ``(provider name, model)`` tuples.
+    Requirements are deduplicated and each data provider gets called once
+    with all models not fetched yet in this request.
+    """
+    memo = _data_memo(request)
+    pending = OrderedDict()
+    for name, model in requirements:
+        entry = memo.get((name, id(model)))
+        # model is kept in memo entry to prevent reuse of its id
+        if entry is not None and entry[0] is model:
+            continue
+        pending.setdefault(name, OrderedDict())[id(model)] = model
+    registry = request.registry
+    for name, models in pending.items():
+        provider = registry.getUtility(ITileDataProvider, name=name)
+        models = list(models.values())
+        for model, value in zip(models, provider(models, request)):
+            memo[(name, id(model))] = (model, value)
+
+
+def get_data(model, request, name):
+    """Return data of data provider by name for model.
+
+    Returns prefetched data if present, otherwise the data gets fetched for
+    this model only.
+    """
+    key = (name, id(model))
+    entry = _data_memo(request).get(key)
+    if entry is None or entry[0] is not model:
+        fetch_data(request, [(name, model)])
+        entry = _data_memo(request)[key]
+    return entry[1]
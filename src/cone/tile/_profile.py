@@ -0,0 +1,241 @@
+from pyramid.settings import asbool
+from zope.interface import Attribute
+from zope.interface import Interface
+from zope.interface import implementer
+try:  # pragma: no coverage
+    import html
+except ImportError:  # pragma: no coverage
+    import cgi as html
+import json
+import threading
+import time
+
+
+PROFILE_KEY = 'cone.tile.profile'
+
+
+class ITileRendered(Interface):
+    """Event notified after a tile has been rendered while profiling is
+    enabled.
+    """
+    request = Attribute(u"The current request.")
+    timing = Attribute(u"``TileTiming`` of the rendered tile.")
+
+
+@implementer(ITileRendered)
+class TileRendered(object):
+    """Tile rendered event.
+    """
+
+    def __init__(self, request, timing):
+        self.request = request
+        self.timing = timing
+
+
+class TileTiming(object):
+    """Timing of a single tile rendering.
+    """
+
+    def __init__(self, name, depth):
+        """Construct tile timing.
+
+        @param name: Name of the rendered tile.
+        @param depth: Nesting depth of the tile rendering.
+        """
+        self.name = name
+        self.depth = depth
+        self.duration = 0.
+        self.phases = dict()
+        self.children = list()
+
+    def add_phase(self, phase, duration):
+        """Add duration of rendering phase, i.e. ``security``, ``prepare`` or
+        ``template``.
+        """
+        self.phases[phase] = self.phases.get(phase, 0.) + duration
+
+    def as_dict(self):
+        return dict(
+            name=self.name,
+            depth=self.depth,
+            duration=self.duration,
+            phases=dict(self.phases),
+            children=[child.as_dict() for child in self.children]
+        )
+
+
+class TileProfile(object):
+    """Records tile timings of a request as call tree.
+
+    Nesting is tracked per thread. Tiles rendered in worker threads appear
+    as root entries.
+    """
+
+    def __init__(self):
+        self.roots = list()
+        self._local = threading.local()
+
+    @property
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = list()
+        return stack
+
+    @property
+    def current(self):
+        """``TileTiming`` of the tile currently rendered in this thread or
+        ``None``.
+        """
+        stack = self._stack
+        return stack[-1][0] if stack else None
+
+    def enter(self, name):
+        """Start timing of tile by name.
+        """
+        stack = self._stack
+        timing = TileTiming(name, len(stack))
+        if stack:
+            stack[-1][0].children.append(timing)
+        else:
+            self.roots.append(timing)
+        stack.append((timing, time.perf_counter()))
+        return timing
+
+    def exit(self):
+        """Stop timing of current tile.
+        """
+        timing, start = self._stack.pop()
+        timing.duration = time.perf_counter() - start
+        return timing
+
+    def add_phase(self, phase, duration):
+        """Add duration of rendering phase to current tile.
+        """
+        timing = self.current
+        if timing is not None:
+            timing.add_phase(phase, duration)
+
+    def timed(self, phase, func, *args, **kw):
+        """Call function and add its duration as rendering phase to current
+        tile.
+        """
+        start = time.perf_counter()
+        try:
+            return func(*args, **kw)
+        finally:
+            self.add_phase(phase, time.perf_counter() - start)
+
+    def timings(self):
+        """Iterate all recorded timings depth first.
+        """
+        def walk(timings):
+            for timing in timings:
+                yield timing
+                for child in walk(timing.children):
+                    yield child
+        return walk(self.roots)
+
+    def as_dict(self):
+        return dict(tiles=[timing.as_dict() for timing in self.roots])
+
+    def to_json(self):
+        """Return call tree as JSON.
+        """
+        return json.dumps(self.as_dict())
+
+    def to_html(self):
+        """Return call tree as HTML.
+        """
+        def render(timings):
+            if not timings:
+                return u''
+            items = list()
+            for timing in timings:
+                phases = u', '.join([
+                    u'{}: {:.3f} ms'.format(html.escape(phase), value * 1000)
+                    for phase, value in sorted(timing.phases.items())
+                ])
+                items.append(u'<li><b>{}</b> {:.3f} ms{}{}</li>'.format(
+                    html.escape(timing.name),
+                    timing.duration * 1000,
+                    u' ({})'.format(phases) if phases else u'',
+                    render(timing.children)
+                ))
+            return u'<ul>{}</ul>'.format(u''.join(items))
+        return u'<div class="tile-profile">{}</div>'.format(render(self.roots))
+
+
+def enable_profiling(request):
+    """Enable tile profiling for request. Returns the ``TileProfile``.
+    """
+    profile = request.environ.get(PROFILE_KEY)
+    if profile is None or profile is False:
+        profile = request.environ[PROFILE_KEY] = TileProfile()
+    return profile
+
+
+def get_profile(request):
+    """Return ``TileProfile`` of request if profiling is enabled, otherwise
+    ``None``.
+
+    Profiling is enabled for all requests if ``cone.tile.profile`` setting
+    is true. This is intended for debugging only. The setting is read once
+    per request, disabled profiling is remembered as ``False`` in request
+    environ.
+    """
+    profile = request.environ.get(PROFILE_KEY)
+    if profile is False:
+        return None
+    if profile is not None:
+        return profile
+    settings = request.registry.settings
+    if settings and asbool(settings.get('cone.tile.profile')):
+        return enable_profiling(request)
+    request.environ[PROFILE_KEY] = False
+    return None
+
+
+class TileStats(object):
+    """Aggregates tile timings in-process.
+
+    Register as subscriber for ``ITileRendered``::
+
+        config.add_subscriber(TileStats(), ITileRendered)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = dict()
+
+    def __call__(self, event):
+        timing = event.timing
+        with self._lock:
+            stats = self._stats.get(timing.name)
+            if stats is None:
+                stats = self._stats[timing.name] = dict(
+                    count=0,
+                    total=0.,
+                    max=0.,
+                    max_depth=0
+                )
+            stats['count'] += 1
+            stats['total'] += timing.duration
+            stats['max'] = max(stats['max'], timing.duration)
+            stats['max_depth'] = max(stats['max_depth'], timing.depth)
+
+    def stats(self):
+        """Return aggregated stats by tile name. Each entry contains
+        ``count``, ``total``, ``mean``, ``max`` and ``max_depth``.
+        """
+        with self._lock:
+            stats = dict()
+            for name, entry in self._stats.items():
+                entry = dict(entry)
+                entry['mean'] = entry['total'] / entry['count']
+                stats[name] = entry
+            return stats
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,336 @@
+from cone.tile._cache import ITileCache
+from zope.interface import implementer
+try:  # pragma: no coverage
+    import fcntl
+except ImportError:  # pragma: no coverage
+    fcntl = None
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+
+_MAGIC = b'CTC2'
+# magic, number of index slots, size of data region, write offset
+_HEADER = struct.Struct('<4sIQQ')
+# generation of tile name and model identity
+_GENERATION = struct.Struct('<Q')
+# key hash, record offset, record length, expiration time, generation index,
+# generation
+_SLOT = struct.Struct('<QQIdIQ')
+# checksum, key length, value length, value type
+_RECORD = struct.Struct('<IIIB')
+_EMPTY = 0
+_DELETED = 1
+_PROBES = 16
+_TEXT = 0
+_BYTES = 1
+
+
+def _serialize_key(key):
+    return repr(key).encode('utf-8')
+
+
+def _serialize_group(key):
+    """Serialize tile name and model identity of key, by which cached values
+    get invalidated.
+    """
+    if isinstance(key, tuple) and len(key) > 1:
+        key = key[:2]
+    return _serialize_key(key)
+
+
+def _hash_key(key_data):
+    digest = hashlib.blake2b(key_data, digest_size=8).digest()
+    # 0 and 1 mark empty and deleted slots
+    return max(int.from_bytes(digest, 'little'), 2)
+
+
+@implementer(ITileCache)
+class SharedTileCache(object):
+    """Tile cache shared between processes on a host via a memory mapped
+    file.
+
+    The file contains a header, a generation table, a fixed size hash index
+    and a data region. Records are appended to the data region, which wraps
+    around once full. Overwritten records are detected by checksum. Writes
+    are serialized by an exclusive file lock and index entries are published
+    after the record has been written, thus readers never see partial
+    writes.
+
+    Index entries refer to the generation of tile name and model identity
+    they have been written with. Invalidation increments the generation,
+    which turns all affected entries stale at once.
+
+    Cache keys must have a stable ``repr`` across processes, which is the
+    case for keys created by ``CachePolicy``. Values are either strings or
+    bytes. Available on POSIX systems only.
+    """
+
+    def __init__(self, path, size=64 * 1024 * 1024, slots=65536):
+        """Construct shared tile cache.
+
+        @param path: Path of the cache file. Created if not exists.
+        @param size: Size of the data region in bytes. Ignored if the cache
+        file already exists.
+        @param slots: Number of index slots, which is the maximum number of
+        entries. Ignored if the cache file already exists.
+        """
+        if fcntl is None:  # pragma: no coverage
+            raise RuntimeError('SharedTileCache requires fcntl')
+        self.path = path
+        self.size = size
+        self.slots = slots
+        self._lock = threading.Lock()
+        self._pid = None
+        self._fd = None
+        self._mm = None
+
+    def _open(self):
+        """Open and map cache file. Reopened in forked processes, file locks
+        of inherited file descriptors would be shared otherwise.
+        """
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        self._close()
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(fd, _HEADER.size, 0)
+            if len(header) == _HEADER.size and header[:4] == _MAGIC:
+                _, slots, size, _ = _HEADER.unpack(header)
+            else:
+                slots, size = self.slots, self.size
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, self._data_offset(slots) + size)
+                os.pwrite(fd, _HEADER.pack(_MAGIC, slots, size, 0), 0)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        self._fd = fd
+        self._mm = mmap.mmap(fd, self._data_offset(slots) + size)
+        self._slots = slots
+        self._data_size = size
+        self._index_start = _HEADER.size + slots * _GENERATION.size
+        self._data_start = self._data_offset(slots)
+        self._pid = pid
+
+    @staticmethod
+    def _data_offset(slots):
+        return _HEADER.size + slots * (_GENERATION.size + _SLOT.size)
+
+    def _close(self):
+        if self._mm is not None:
+            self._mm.close()
+            os.close(self._fd)
+        self._mm = self._fd = self._pid = None
+
+    def _acquire(self, exclusive):
+        self._lock.acquire()
+        try:
+            self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        except BaseException:
+            self._lock.release()
+            raise
+
+    def _release(self):
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._lock.release()
+
+    def _slot(self, index):
+        return _SLOT.unpack_from(
+            self._mm, self._index_start + index * _SLOT.size)
+
+    def _write_slot(self, index, key_hash, offset=0, length=0, expires=0.,
+                    group=0, generation=0):
+        _SLOT.pack_into(
+            self._mm,
+            self._index_start + index * _SLOT.size,
+            key_hash,
+            offset,
+            length,
+            expires,
+            group,
+            generation)
+
+    def _group(self, key):
+        """Return index of generation of tile name and model identity of
+        key. Colliding groups share their generation.
+        """
+        return _hash_key(_serialize_group(key)) % self._slots
+
+    def _generation(self, group):
+        return _GENERATION.unpack_from(
+            self._mm, _HEADER.size + group * _GENERATION.size)[0]
+
+    def _live(self, slot, now):
+        """Check whether index slot is neither empty, deleted, expired nor
+        invalidated.
+        """
+        if slot[0] in (_EMPTY, _DELETED):
+            return False
+        if slot[3] and slot[3] < now:
+            return False
+        return slot[5] == self._generation(slot[4])
+
+    def _record(self, offset, length):
+        """Read record. Returns ``(key data, value)`` or ``None`` if record
+        has been overwritten.
+        """
+        if offset + length > self._data_size or length < _RECORD.size:
+            return None
+        start = self._data_start + offset
+        crc, key_length, value_length, value_type = _RECORD.unpack_from(
+            self._mm, start)
+        if _RECORD.size + key_length + value_length != length:
+            return None
+        data = self._mm[start + _RECORD.size:start + length]
+        if zlib.crc32(data) != crc:
+            return None
+        value = data[key_length:]
+        if value_type == _TEXT:
+            value = value.decode('utf-8')
+        return data[:key_length], value
+
+    def _entry(self, slot, now):
+        """Read record of index slot. Returns ``(key data, value)`` or
+        ``None`` if slot is not live or record has been overwritten.
+        """
+        if not self._live(slot, now):
+            return None
+        record = self._record(slot[1], slot[2])
+        if record is None or _hash_key(record[0]) != slot[0]:
+            return None
+        return record
+
+    def _find(self, key_hash, key_data):
+        """Find index slot of key. Returns ``(index, slot, value)`` or
+        ``None``.
+        """
+        slots = self._slots
+        for probe in range(_PROBES):
+            index = (key_hash + probe) % slots
+            slot = self._slot(index)
+            if slot[0] == _EMPTY:
+                return None
+            if slot[0] != key_hash:
+                continue
+            record = self._record(slot[1], slot[2])
+            if record is not None and record[0] == key_data:
+                return index, slot, record[1]
+        return None
+
+    def get(self, key):
+        key_data = _serialize_key(key)
+        self._acquire(False)
+        try:
+            found = self._find(_hash_key(key_data), key_data)
+            if found is None or not self._live(found[1], time.time()):
+                return None
+            return found[2]
+        finally:
+            self._release()
+
+    def set(self, key, value, ttl=None):
+        key_data = _serialize_key(key)
+        key_hash = _hash_key(key_data)
+        if isinstance(value, bytes):
+            value_type, value_data = _BYTES, value
+        else:
+            value_type, value_data = _TEXT, value.encode('utf-8')
+        data = key_data + value_data
+        record = _RECORD.pack(
+            zlib.crc32(data),
+            len(key_data),
+            len(value_data),
+            value_type) + data
+        now = time.time()
+        expires = now + ttl if ttl is not None else 0.
+        self._acquire(True)
+        try:
+            if len(record) > self._data_size:
+                return
+            _, slots, size, offset = _HEADER.unpack_from(self._mm, 0)
+            if offset + len(record) > size:
+                offset = 0
+            start = self._data_start + offset
+            self._mm[start:start + len(record)] = record
+            _HEADER.pack_into(
+                self._mm, 0, _MAGIC, slots, size, offset + len(record))
+            found = self._find(key_hash, key_data)
+            if found is not None:
+                index = found[0]
+            else:
+                index = self._free_slot(key_hash, now)
+            group = self._group(key)
+            # publish record
+            self._write_slot(
+                index,
+                key_hash,
+                offset,
+                len(record),
+                expires,
+                group,
+                self._generation(group))
+        finally:
+            self._release()
+
+    def _free_slot(self, key_hash, now):
+        """Return index of first free slot for hash. Slots of expired,
+        invalidated or overwritten entries are free. If no slot is free, the
+        first slot gets replaced.
+        """
+        slots = self._slots
+        for probe in range(_PROBES):
+            index = (key_hash + probe) % slots
+            if self._entry(self._slot(index), now) is None:
+                return index
+        return key_hash % slots
+
+    def delete(self, key):
+        key_data = _serialize_key(key)
+        self._acquire(True)
+        try:
+            found = self._find(_hash_key(key_data), key_data)
+            if found is not None:
+                self._write_slot(found[0], _DELETED)
+        finally:
+            self._release()
+
+    def clear(self):
+        self._acquire(True)
+        try:
+            index_end = self._data_start
+            self._mm[_HEADER.size:index_end] = bytes(index_end - _HEADER.size)
+            _HEADER.pack_into(
+                self._mm, 0, _MAGIC, self._slots, self._data_size, 0)
+        finally:
+            self._release()
+
+    def invalidate(self, name, model_key):
+        self._acquire(True)
+        try:
+            group = self._group((name, model_key))
+            _GENERATION.pack_into(
+                self._mm,
+                _HEADER.size + group * _GENERATION.size,
+                self._generation(group) + 1)
+        finally:
+            self._release()
+
+    def __len__(self):
+        """Return number of live entries. Scans the index without file lock,
+        thus the result is approximate while other processes write.
+        """
+        count = 0
+        now = time.time()
+        with self._lock:
+            self._open()
+            for index in range(self._slots):
+                if self._entry(self._slot(index), now) is not None:
+                    count += 1
+        return count
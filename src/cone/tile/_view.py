@@ -0,0 +1,204 @@
+from cone.tile._api import _apply_freshness
+from cone.tile._api import _cached_tile_bytes
+from cone.tile._api import _lookup_tile
+from cone.tile._api import _lookup_tiles
+from cone.tile._api import _prefetch_data
+from cone.tile._api import _render_tile
+from cone.tile._api import DEFERRED_TILE_VIEW
+from cone.tile._api import render_tile
+from cone.tile._api import render_to_response
+from cone.tile._api import TIMEOUT_KEY
+from pyramid.httpexceptions import HTTPBadRequest
+from pyramid.httpexceptions import HTTPForbidden
+from pyramid.httpexceptions import HTTPNotFound
+from pyramid.interfaces import IResponseFactory
+from pyramid.interfaces import ISecuredView
+from pyramid.interfaces import IViewClassifier
+from pyramid.traversal import find_resource
+from webob import Response
+from webob.acceptparse import create_accept_encoding_header
+from webob.exc import HTTPFound
+from zope.component import ComponentLookupError
+from zope.interface import providedBy
+import json
+import uuid
+
+
+BULK_TILES_VIEW = 'bulk_tiles'
+"""Name of the view rendering multiple tiles at once.
+"""
+
+
+def deferred_tile_view(model, request):
+    """Render deferred tile by name given in ``name`` request parameter.
+
+    Only tiles registered as deferred or with a deferred placeholder as
+    timeout fallback are rendered. The time budget of the tile is ignored.
+    Security checks are done by the tile. Compressed output of cached tiles
+    is delivered as is if the client accepts gzip.
+    """
+    name = request.params.get('name')
+    factory = _lookup_tile(model, request, name) if name else None
+    deferrable = getattr(factory, '__defer__', None) or \
+        getattr(factory, '__fallback__', None) in ('ajax', 'esi')
+    if not deferrable:
+        raise HTTPNotFound('No deferred tile found: {}'.format(name))
+    request.environ[TIMEOUT_KEY] = False
+    accept_encoding = request.headers.get('Accept-Encoding')
+    if accept_encoding and create_accept_encoding_header(
+            accept_encoding).acceptable_offers(['gzip']):
+        compressed = _cached_tile_bytes(factory, model, request, 'gzip')
+        if compressed is not None:
+            return _compressed_response(request, compressed)
+    result = render_tile(model, request, name, catch_errors=False)
+    return render_to_response(request, result)
+
+
+def _compressed_response(request, body):
+    """Create response from gzip compressed body.
+    """
+    response_factory = request.registry.queryUtility(
+        IResponseFactory,
+        default=Response)
+    response = response_factory(body)
+    response.content_encoding = 'gzip'
+    response.vary = ('Accept-Encoding',)
+    return _apply_freshness(request, response)
+
+
+def _bulk_tiles_request(request):
+    """Read list of ``(path, name)`` pairs from request. Expects either a
+    ``tiles`` request parameter containing JSON or a JSON request body.
+    """
+    try:
+        tiles = request.params.get('tiles')
+        tiles = request.json_body if tiles is None else json.loads(tiles)
+        pairs = [(str(path), str(name)) for path, name in tiles]
+    except (TypeError, ValueError):
+        raise HTTPBadRequest('Expected JSON list of (path, name) pairs')
+    return pairs
+
+
+def _secured_view(factory, model, request, name):
+    """Check whether tile is registered as secured view, thus is accessible
+    by URL. Tiles registered without permission are not.
+    """
+    if getattr(factory, '__permitted__', None) is not None:
+        return True
+    secured = request.registry.adapters.lookup(
+        (IViewClassifier, providedBy(request), providedBy(model)),
+        ISecuredView,
+        name=name)
+    return secured is factory
+
+
+def _render_bulk_tile(factory, model, request, name):
+    """Render tile for bulk tiles view. Returns tuple containing rendered
+    tile and error.
+    """
+    if model is None or factory is None:
+        return u'', 'not found'
+    if not _secured_view(factory, model, request, name):
+        return u'', 'not found'
+    try:
+        return _render_tile(factory, model, request, name, False), None
+    except ComponentLookupError:
+        return u'', 'not found'
+    except HTTPForbidden:
+        return u'', 'forbidden'
+
+
+def _multipart_response(request, results):
+    """Create ``multipart/mixed`` response containing a part per tile.
+    """
+    boundary = uuid.uuid4().hex
+    parts = list()
+    for result in results:
+        headers = [
+            'Content-Type: text/html; charset=utf-8',
+            'X-Tile-Path: {}'.format(json.dumps(result['path'])),
+            'X-Tile-Name: {}'.format(json.dumps(result['name']))
+        ]
+        if result['error']:
+            headers.append('X-Tile-Error: {}'.format(result['error']))
+        parts.append(u'--{}\r\n{}\r\n\r\n{}\r\n'.format(
+            boundary,
+            u'\r\n'.join(headers),
+            result['html']
+        ))
+    parts.append(u'--{}--\r\n'.format(boundary))
+    response_factory = request.registry.queryUtility(
+        IResponseFactory,
+        default=Response)
+    response = response_factory(u''.join(parts).encode('utf-8'))
+    response.content_type = 'multipart/mixed'
+    response.content_type_params = {'boundary': boundary}
+    return response
+
+
+def bulk_tiles_view(model, request):
+    """Render multiple tiles on multiple models at once.
+
+    Tiles are given as JSON list of ``[path, name]`` pairs, either in
+    ``tiles`` request parameter or as JSON request body. ``path`` is the
+    traversal path of the model, relative to context or absolute. Each model
+    gets traversed once and security checks are shared between the tiles.
+
+    Returns a JSON response containing a ``tiles`` list with ``path``,
+    ``name``, ``html`` and ``error`` of each tile. Only tiles registered
+    with a permission are rendered, others are reported as not found. If
+    the request accepts ``multipart/mixed`` but not JSON, a multipart
+    response containing a part per tile is returned. If a redirect is
+    triggered, the JSON response contains the ``redirect`` URL, respective
+    a HTTPFound instance is returned for multipart.
+    """
+    pairs = _bulk_tiles_request(request)
+    models = dict()
+    for path, name in pairs:
+        if path in models:
+            continue
+        try:
+            models[path] = find_resource(model, path)
+        except KeyError:
+            models[path] = None
+    tiles = _lookup_tiles(model, request, [
+        (name, models[path]) for path, name in pairs
+        if models[path] is not None
+    ])
+    _prefetch_data(request, tiles)
+    factories = dict([((name, id(context)), factory)
+                      for name, context, factory in tiles])
+    request.environ['redirect'] = None
+    results = list()
+    for path, name in pairs:
+        context = models[path]
+        factory = factories.get((name, id(context)))
+        rendered, error = _render_bulk_tile(factory, context, request, name)
+        results.append(dict(path=path, name=name, html=rendered, error=error))
+    offers = request.accept.acceptable_offers(
+        ['application/json', 'multipart/mixed'])
+    multipart = bool(offers) and offers[0][0] == 'multipart/mixed'
+    redirect = request.environ['redirect']
+    if redirect:
+        if multipart:
+            return render_to_response(request, u'')
+        if isinstance(redirect, HTTPFound):
+            redirect = redirect.location
+        data = dict(redirect=redirect)
+    elif multipart:
+        return _multipart_response(request, results)
+    else:
+        data = dict(tiles=results)
+    response_factory = request.registry.queryUtility(
+        IResponseFactory,
+        default=Response)
+    response = response_factory(json.dumps(data))
+    response.content_type = 'application/json'
+    return response
+
+
+def includeme(config):
+    """Register tile views.
+    """
+    config.add_view(deferred_tile_view, name=DEFERRED_TILE_VIEW)
+    config.add_view(bulk_tiles_view, name=BULK_TILES_VIEW)
@@ -0,0 +1,287 @@
+from cone.tile import CachePolicy
+from cone.tile import ITileCache
+from cone.tile import MemoryTileCache
+from cone.tile._cache import default_cache
+from cone.tile._cache import model_key
+from cone.tile._cache import principals_key
+from pyramid import testing
+from pyramid.authentication import CallbackAuthenticationPolicy
+from pyramid.interfaces import IAuthenticationPolicy
+from unittest import mock
+import sys
+import unittest
+
+
+class TestMemoryTileCache(unittest.TestCase):
+
+    def test_get_set_delete(self):
+        cache = MemoryTileCache()
+        self.assertTrue(ITileCache.providedBy(cache))
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', u'A')
+        self.assertEqual(cache.get('a'), u'A')
+        self.assertEqual(len(cache), 1)
+        cache.delete('a')
+        cache.delete('a')
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', u'A')
+        cache.set('b', u'B')
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_ttl(self):
+        cache = MemoryTileCache()
+        with mock.patch('cone.tile._cache.time.monotonic', return_value=10.):
+            cache.set('a', u'A', ttl=5)
+            cache.set('b', u'B')
+        with mock.patch('cone.tile._cache.time.monotonic', return_value=14.):
+            self.assertEqual(cache.get('a'), u'A')
+        with mock.patch('cone.tile._cache.time.monotonic', return_value=16.):
+            self.assertIsNone(cache.get('a'))
+            self.assertEqual(cache.get('b'), u'B')
+        self.assertEqual(len(cache), 1)
+
+    def test_lru(self):
+        cache = MemoryTileCache(maxsize=2)
+        cache.set('a', u'A')
+        cache.set('b', u'B')
+        # access ``a`` to mark it recently used
+        cache.get('a')
+        cache.set('c', u'C')
+        self.assertEqual(cache.get('a'), u'A')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), u'C')
+
+
+    def test_maxbytes(self):
+        value = u'x' * 100
+        size = sys.getsizeof(value)
+        cache = MemoryTileCache(maxbytes=size * 2)
+        cache.set(('a', 1), value)
+        cache.set(('a', 2), value)
+        self.assertEqual(cache.size, size * 2)
+        cache.set(('b', 1), value)
+        self.assertIsNone(cache.get(('a', 1)))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.size, size * 2)
+
+        # Values exceeding budget are not cached
+        cache.set(('c', 1), value * 3)
+        self.assertIsNone(cache.get(('c', 1)))
+        self.assertEqual(len(cache), 2)
+
+        # Replacing value updates size
+        cache.set(('b', 1), u'')
+        self.assertEqual(cache.size, size + sys.getsizeof(u''))
+        cache.delete(('b', 1))
+        cache.delete(('a', 2))
+        self.assertEqual(cache.size, 0)
+
+    def test_name_maxbytes(self):
+        value = u'x' * 100
+        size = sys.getsizeof(value)
+        cache = MemoryTileCache(name_maxbytes=size * 2)
+        cache.set(('a', 1), value)
+        cache.set(('a', 2), value)
+        cache.set(('b', 1), value)
+        cache.set(('a', 3), value)
+        self.assertIsNone(cache.get(('a', 1)))
+        self.assertEqual(cache.get(('a', 2)), value)
+        self.assertEqual(cache.get(('b', 1)), value)
+        self.assertEqual(cache.stats()['names'], {
+            'a': {'entries': 2, 'size': size * 2},
+            'b': {'entries': 1, 'size': size}
+        })
+
+        # Budgets by tile name
+        cache = MemoryTileCache(name_maxbytes={'a': size})
+        cache.set(('a', 1), value)
+        cache.set(('a', 2), value)
+        cache.set(('b', 1), value)
+        cache.set(('b', 2), value)
+        self.assertIsNone(cache.get(('a', 1)))
+        self.assertEqual(len(cache), 3)
+
+    def test_lfu(self):
+        with self.assertRaises(ValueError) as err:
+            MemoryTileCache(eviction='invalid')
+        self.assertEqual(
+            str(err.exception),
+            'Invalid ``eviction`` value: invalid'
+        )
+
+        cache = MemoryTileCache(maxsize=2, eviction='lfu')
+        cache.set('a', u'A')
+        cache.set('b', u'B')
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+        cache.set('c', u'C')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), u'A')
+        self.assertEqual(cache.get('c'), u'C')
+
+        # Least recently used entry evicted on equal frequency
+        cache = MemoryTileCache(maxsize=2, eviction='lfu')
+        cache.set('a', u'A')
+        cache.set('b', u'B')
+        cache.set('c', u'C')
+        self.assertIsNone(cache.get('a'))
+
+        # Frequencies survive removal of entries with other frequencies
+        cache = MemoryTileCache(maxsize=3, eviction='lfu')
+        cache.set('a', u'A')
+        cache.set('b', u'B')
+        cache.set('c', u'C')
+        for key, count in [('a', 3), ('b', 1), ('c', 2)]:
+            for i in range(count):
+                cache.get(key)
+        cache.delete('c')
+        cache.set('d', u'D')
+        cache.get('d')
+        cache.get('d')
+        cache.set('e', u'E')
+        self.assertIsNone(cache.get('b'))
+        cache.set('f', u'F')
+        # ``e`` has not been used yet, ``d`` twice
+        self.assertIsNone(cache.get('e'))
+        self.assertEqual(cache.get('a'), u'A')
+        self.assertEqual(cache.get('d'), u'D')
+
+        # Memory budget per tile name
+        cache = MemoryTileCache(
+            name_maxbytes=sys.getsizeof(u'A') * 2,
+            eviction='lfu')
+        cache.set(('nav', 'a'), u'A')
+        cache.set(('nav', 'b'), u'B')
+        cache.set(('other', 'a'), u'A')
+        cache.get(('nav', 'a'))
+        cache.set(('nav', 'c'), u'C')
+        self.assertIsNone(cache.get(('nav', 'b')))
+        self.assertEqual(cache.get(('nav', 'a')), u'A')
+        self.assertEqual(cache.get(('other', 'a')), u'A')
+
+        # Zero size cache
+        cache = MemoryTileCache(maxsize=0, eviction='lfu')
+        cache.set('a', u'A')
+        self.assertEqual(len(cache), 0)
+
+    def test_invalidate(self):
+        cache = MemoryTileCache()
+        cache.set(('nav', (None, 'a')), u'A')
+        cache.set(('nav', (None, 'a'), ('max',)), u'A max')
+        cache.set(('nav', (None, 'b')), u'B')
+        cache.set(('menu', (None, 'a')), u'Menu')
+        cache.set('plain', u'Plain')
+        cache.invalidate('nav', (None, 'a'))
+        self.assertEqual(len(cache), 3)
+        self.assertIsNone(cache.get(('nav', (None, 'a'), ('max',))))
+        self.assertEqual(cache.get(('nav', (None, 'b'))), u'B')
+        self.assertEqual(cache.get(('menu', (None, 'a'))), u'Menu')
+        cache.invalidate('nav', (None, 'a'))
+        cache.clear()
+        self.assertEqual(cache._models, {})
+
+    def test_stats(self):
+        cache = MemoryTileCache(maxsize=1)
+        cache.get(('a', 1))
+        cache.set(('a', 1), u'A')
+        cache.get(('a', 1))
+        cache.set(('b', 1), u'B')
+        self.assertEqual(cache.stats(), {
+            'hits': 1,
+            'misses': 1,
+            'evictions': 1,
+            'entries': 1,
+            'size': sys.getsizeof(u'B'),
+            'names': {'b': {'entries': 1, 'size': sys.getsizeof(u'B')}}
+        })
+        cache.clear()
+        self.assertEqual(cache.stats()['size'], 0)
+        self.assertEqual(cache.stats()['names'], {})
+
+
+class Model(testing.DummyResource):
+    pass
+
+
+class TestCachePolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.config = testing.setUp()
+
+    def tearDown(self):
+        testing.tearDown()
+
+    def test_model_key(self):
+        model = Model()
+        model.path = [None, 'a']
+        self.assertEqual(model_key(model), (None, 'a'))
+
+        root = testing.DummyResource()
+        child = root['child'] = testing.DummyResource()
+        self.assertEqual(model_key(child), ('', 'child'))
+
+    def test_principals_key(self):
+        request = testing.DummyRequest()
+        self.assertEqual(principals_key(request), ())
+
+        authn = CallbackAuthenticationPolicy()
+        authn.callback = lambda userid, request: ['group:b', 'group:a']
+        authn.unauthenticated_userid = lambda request: 'max'
+        self.config.registry.registerUtility(authn, IAuthenticationPolicy)
+        self.assertEqual(principals_key(request), (
+            'group:a',
+            'group:b',
+            'max',
+            'system.Authenticated',
+            'system.Everyone'
+        ))
+
+    def test_key(self):
+        model = Model()
+        model.path = [None, 'a']
+        request = testing.DummyRequest(params={'b_page': '2', 'other': '1'})
+
+        policy = CachePolicy()
+        self.assertEqual(policy.key(model, request, 'nav'), ('nav', (None, 'a')))
+
+        policy = CachePolicy(
+            principals=True,
+            params=['b_page', 'missing'],
+            key=lambda model, request, name: request.method
+        )
+        self.assertEqual(policy.key(model, request, 'nav'), (
+            'nav',
+            (None, 'a'),
+            (),
+            ('2', None),
+            'GET'
+        ))
+
+    def test_cache(self):
+        request = testing.DummyRequest()
+        policy = CachePolicy()
+        self.assertTrue(policy.cache(request) is default_cache)
+
+        utility = MemoryTileCache()
+        self.config.registry.registerUtility(utility, ITileCache)
+        self.assertTrue(policy.cache(request) is utility)
+
+        backend = MemoryTileCache()
+        policy = CachePolicy(backend=backend)
+        self.assertTrue(policy.cache(request) is backend)
+
+    def test_encode(self):
+        policy = CachePolicy()
+        self.assertFalse(policy.encode)
+        self.assertFalse(policy.compress)
+
+        policy = CachePolicy(encode=True)
+        self.assertTrue(policy.encode)
+        self.assertFalse(policy.compress)
+
+        # compression implies encoding
+        policy = CachePolicy(compress=True)
+        self.assertTrue(policy.encode)
+        self.assertTrue(policy.compress)
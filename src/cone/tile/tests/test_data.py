@@ -0,0 +1,69 @@
+from cone.tile import get_data
+from cone.tile import ITileDataProvider
+from cone.tile import register_data_provider
+from cone.tile._data import fetch_data
+from pyramid import testing
+from zope.component import ComponentLookupError
+import unittest
+
+
+class Model(testing.DummyResource):
+    pass
+
+
+class TestData(unittest.TestCase):
+
+    def setUp(self):
+        self.config = testing.setUp()
+
+    def tearDown(self):
+        testing.tearDown()
+
+    def test_register_data_provider(self):
+        def provider(models, request):
+            return [model.__name__ for model in models]
+
+        register_data_provider('names', provider)
+        registry = self.config.registry
+        self.assertTrue(
+            registry.getUtility(ITileDataProvider, name='names') is provider
+        )
+
+    def test_fetch_data(self):
+        calls = []
+
+        def provider(models, request):
+            calls.append([model.__name__ for model in models])
+            return [model.__name__.upper() for model in models]
+
+        register_data_provider('names', provider)
+        request = testing.DummyRequest()
+        root = Model()
+        a = root['a'] = Model()
+        b = root['b'] = Model()
+
+        # Requirements are deduplicated and fetched at once
+        fetch_data(request, [('names', a), ('names', b), ('names', a)])
+        self.assertEqual(calls, [['a', 'b']])
+        self.assertEqual(get_data(a, request, 'names'), 'A')
+        self.assertEqual(get_data(b, request, 'names'), 'B')
+        self.assertEqual(calls, [['a', 'b']])
+
+        # Already fetched data is not fetched again
+        c = root['c'] = Model()
+        fetch_data(request, [('names', a), ('names', c)])
+        self.assertEqual(calls, [['a', 'b'], ['c']])
+
+        # Data not prefetched gets fetched on access
+        d = root['d'] = Model()
+        self.assertEqual(get_data(d, request, 'names'), 'D')
+        self.assertEqual(calls, [['a', 'b'], ['c'], ['d']])
+
+        # Data is scoped to request
+        request = testing.DummyRequest()
+        self.assertEqual(get_data(a, request, 'names'), 'A')
+        self.assertEqual(calls, [['a', 'b'], ['c'], ['d'], ['a']])
+
+        # Unknown data provider
+        with self.assertRaises(ComponentLookupError):
+            get_data(a, request, 'unknown')
@@ -0,0 +1,113 @@
+from cone.tile import enable_profiling
+from cone.tile import get_profile
+from cone.tile import ITileRendered
+from cone.tile import TileProfile
+from cone.tile import TileRendered
+from cone.tile import TileStats
+from pyramid import testing
+from unittest import mock
+import json
+import unittest
+
+
+class TestTileProfile(unittest.TestCase):
+
+    def test_call_tree(self):
+        profile = TileProfile()
+        self.assertIsNone(profile.current)
+
+        # Phases without tile are ignored
+        profile.add_phase('template', 1.)
+
+        with mock.patch('cone.tile._profile.time.perf_counter') as counter:
+            counter.side_effect = [0., 1., 2., 3., 4., 5.]
+            outer = profile.enter('outer')
+            self.assertTrue(profile.current is outer)
+            inner = profile.enter('inner')
+            self.assertTrue(profile.current is inner)
+            profile.timed('prepare', lambda: None)
+            self.assertTrue(profile.exit() is inner)
+            self.assertTrue(profile.exit() is outer)
+
+        self.assertEqual(profile.roots, [outer])
+        self.assertEqual(outer.children, [inner])
+        self.assertEqual((outer.depth, outer.duration), (0, 5.))
+        self.assertEqual((inner.depth, inner.duration), (1, 3.))
+        self.assertEqual(inner.phases, {'prepare': 1.})
+        self.assertEqual(list(profile.timings()), [outer, inner])
+
+        self.assertEqual(json.loads(profile.to_json()), {'tiles': [{
+            'name': 'outer',
+            'depth': 0,
+            'duration': 5.,
+            'phases': {},
+            'children': [{
+                'name': 'inner',
+                'depth': 1,
+                'duration': 3.,
+                'phases': {'prepare': 1.},
+                'children': []
+            }]
+        }]})
+        self.assertEqual(profile.to_html(), (
+            '<div class="tile-profile"><ul><li><b>outer</b> 5000.000 ms'
+            '<ul><li><b>inner</b> 3000.000 ms (prepare: 1000.000 ms)</li>'
+            '</ul></li></ul></div>'
+        ))
+
+    def test_get_profile(self):
+        request = testing.DummyRequest()
+        request.registry = mock.Mock(settings=None)
+        self.assertIsNone(get_profile(request))
+
+        # Setting is read once per request
+        request.registry = mock.Mock(settings={'cone.tile.profile': 'true'})
+        self.assertIsNone(get_profile(request))
+
+        profile = enable_profiling(request)
+        self.assertTrue(isinstance(profile, TileProfile))
+        self.assertTrue(enable_profiling(request) is profile)
+        self.assertTrue(get_profile(request) is profile)
+
+        # Enable profiling by settings
+        request = testing.DummyRequest()
+        request.registry = mock.Mock(settings={'cone.tile.profile': 'true'})
+        profile = get_profile(request)
+        self.assertTrue(isinstance(profile, TileProfile))
+        self.assertTrue(get_profile(request) is profile)
+
+
+class TestTileStats(unittest.TestCase):
+
+    def test_stats(self):
+        request = testing.DummyRequest()
+        profile = TileProfile()
+        stats = TileStats()
+        with mock.patch('cone.tile._profile.time.perf_counter') as counter:
+            counter.side_effect = [0., 1., 2., 5., 6., 8.]
+            profile.enter('a')
+            profile.enter('b')
+            event = TileRendered(request, profile.exit())
+            self.assertTrue(ITileRendered.providedBy(event))
+            stats(event)
+            stats(TileRendered(request, profile.exit()))
+            profile.enter('b')
+            stats(TileRendered(request, profile.exit()))
+        self.assertEqual(stats.stats(), {
+            'a': {
+                'count': 1,
+                'total': 5.,
+                'mean': 5.,
+                'max': 5.,
+                'max_depth': 0
+            },
+            'b': {
+                'count': 2,
+                'total': 3.,
+                'mean': 1.5,
+                'max': 2.,
+                'max_depth': 1
+            }
+        })
+        stats.clear()
+        self.assertEqual(stats.stats(), {})
@@ -0,0 +1,148 @@
+from cone.tile import ITileCache
+from cone.tile import SharedTileCache
+from unittest import mock
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class TestSharedTileCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'tiles.cache')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_get_set_delete(self):
+        cache = SharedTileCache(self.path, size=4096, slots=64)
+        self.assertTrue(ITileCache.providedBy(cache))
+        self.assertIsNone(cache.get(('a',)))
+        cache.set(('a',), u'A\xe4')
+        self.assertEqual(cache.get(('a',)), u'A\xe4')
+        cache.set(('b',), b'B')
+        self.assertEqual(cache.get(('b',)), b'B')
+        self.assertEqual(len(cache), 2)
+
+        # overwrite
+        cache.set(('a',), u'AA')
+        self.assertEqual(cache.get(('a',)), u'AA')
+        self.assertEqual(len(cache), 2)
+
+        cache.delete(('a',))
+        cache.delete(('a',))
+        self.assertIsNone(cache.get(('a',)))
+        self.assertEqual(len(cache), 1)
+
+        cache.clear()
+        self.assertIsNone(cache.get(('b',)))
+        self.assertEqual(len(cache), 0)
+
+    def test_ttl(self):
+        cache = SharedTileCache(self.path, size=4096, slots=64)
+        with mock.patch('cone.tile._shared.time.time', return_value=100.):
+            cache.set(('a',), u'A', ttl=10)
+            cache.set(('b',), u'B')
+        with mock.patch('cone.tile._shared.time.time', return_value=105.):
+            self.assertEqual(cache.get(('a',)), u'A')
+        with mock.patch('cone.tile._shared.time.time', return_value=111.):
+            self.assertIsNone(cache.get(('a',)))
+            self.assertEqual(cache.get(('b',)), u'B')
+            self.assertEqual(len(cache), 1)
+
+    def test_shared(self):
+        cache = SharedTileCache(self.path, size=4096, slots=64)
+        cache.set(('a',), u'A')
+
+        # layout of existing cache file is used
+        other = SharedTileCache(self.path, size=1024, slots=8)
+        self.assertEqual(other.get(('a',)), u'A')
+        other.set(('b',), u'B')
+        self.assertEqual(cache.get(('b',)), u'B')
+        other.clear()
+        self.assertIsNone(cache.get(('a',)))
+
+        # invalid cache file gets initialized
+        with open(self.path, 'wb') as f:
+            f.write(b'invalid')
+        cache = SharedTileCache(self.path, size=4096, slots=64)
+        self.assertIsNone(cache.get(('a',)))
+        cache.set(('a',), u'A')
+        self.assertEqual(cache.get(('a',)), u'A')
+
+    @unittest.skipUnless(
+        'fork' in multiprocessing.get_all_start_methods(),
+        'fork not available')
+    def test_fork(self):
+        cache = SharedTileCache(self.path, size=4096, slots=64)
+        cache.set(('a',), u'A')
+
+        def worker():
+            cache.set(('b',), cache.get(('a',)) + u'B')
+
+        context = multiprocessing.get_context('fork')
+        process = context.Process(target=worker)
+        process.start()
+        process.join()
+        self.assertEqual(process.exitcode, 0)
+        self.assertEqual(cache.get(('b',)), u'AB')
+
+    def test_wrap_around(self):
+        cache = SharedTileCache(self.path, size=256, slots=64)
+        cache.set(('a',), u'A' * 100)
+        cache.set(('b',), u'B' * 100)
+        # data region is full, oldest record gets overwritten
+        cache.set(('c',), u'C' * 100)
+        self.assertIsNone(cache.get(('a',)))
+        self.assertEqual(cache.get(('b',)), u'B' * 100)
+        self.assertEqual(cache.get(('c',)), u'C' * 100)
+        self.assertEqual(len(cache), 2)
+
+        # values exceeding data region are not cached
+        cache.set(('d',), u'D' * 300)
+        self.assertIsNone(cache.get(('d',)))
+
+        # slots of overwritten records are reused, live entries are kept
+        cache = SharedTileCache(self.path + '2', size=256, slots=2)
+        cache.set(('a',), u'A' * 100)
+        cache.set(('b',), u'B' * 100)
+        cache.set(('c',), u'C' * 100)
+        self.assertEqual(cache.get(('b',)), u'B' * 100)
+        self.assertEqual(cache.get(('c',)), u'C' * 100)
+        cache.set(('d',), u'D' * 100)
+        self.assertEqual(cache.get(('c',)), u'C' * 100)
+        self.assertEqual(cache.get(('d',)), u'D' * 100)
+
+    def test_slots_exhausted(self):
+        cache = SharedTileCache(self.path, size=4096, slots=2)
+        cache.set(('a',), u'A')
+        cache.set(('b',), u'B')
+        cache.set(('c',), u'C')
+        self.assertEqual(cache.get(('c',)), u'C')
+        self.assertEqual(len(cache), 2)
+
+    def test_invalidate(self):
+        cache = SharedTileCache(self.path, size=4096, slots=64)
+        cache.set(('nav', (None, 'a')), u'1')
+        cache.set(('nav', (None, 'a'), ('admin',)), u'2')
+        cache.set(('nav', (None, 'a', 'b')), u'3')
+        cache.set(('nav', (None, 'b')), u'4')
+        cache.set(('other', (None, 'a')), u'5')
+        # invalidation does not scan the index
+        with mock.patch.object(cache, '_slot') as slot:
+            cache.invalidate('nav', (None, 'a'))
+            self.assertFalse(slot.called)
+        self.assertIsNone(cache.get(('nav', (None, 'a'))))
+        self.assertIsNone(cache.get(('nav', (None, 'a'), ('admin',))))
+        self.assertEqual(cache.get(('nav', (None, 'a', 'b'))), u'3')
+        self.assertEqual(cache.get(('nav', (None, 'b'))), u'4')
+        self.assertEqual(cache.get(('other', (None, 'a'))), u'5')
+        self.assertEqual(len(cache), 3)
+
+        # invalidated entries are written again with current generation
+        cache.set(('nav', (None, 'a')), u'6')
+        self.assertEqual(cache.get(('nav', (None, 'a'))), u'6')
+        self.assertEqual(len(cache), 4)
@@ -1,31 +1,86 @@
+from cone.tile import bulk_tiles_view
+from cone.tile import CachePolicy
+from cone.tile import check_freshness
+from cone.tile import child_urls
+from cone.tile import deferred_tile_url
+from cone.tile import deferred_tile_view
+from cone.tile import enable_profiling
+from cone.tile import get_profile
+from cone.tile import has_tile
+from cone.tile import includeme
+from cone.tile import invalidate_node_urls
+from cone.tile import invalidate_security_cache
+from cone.tile import invalidate_tile_memo
+from cone.tile import ITileRendered
+from cone.tile import MemoryTileCache
+from cone.tile import node_url
+from cone.tile import prefetch_data
+from cone.tile import register_data_provider
 from cone.tile import register_tile
+from cone.tile import register_tiles
 from cone.tile import render_template
 from cone.tile import render_template_to_response
 from cone.tile import render_tile
+from cone.tile import render_tile_async
+from cone.tile import render_tiles
+from cone.tile import render_tiles_async
 from cone.tile import render_to_response
+from cone.tile import stream_tiles_to_response
 from cone.tile import Tile
 from cone.tile import tile
 from cone.tile import TileRenderer
+from cone.tile._api import _bind_tile
+from cone.tile._api import _get_timeout_executor
+from cone.tile._api import _lookup_tile
+from cone.tile._api import _template_renderer
+from cone.tile._api import _tile_index
+from cone.tile._api import MEMO_KEY
+from cone.tile._api import NODE_URL_KEY
+from concurrent.futures import ThreadPoolExecutor
 from pyramid import testing
 from pyramid.authentication import CallbackAuthenticationPolicy
 from pyramid.authorization import ACLAuthorizationPolicy
+from pyramid.config import Configurator
+from datetime import datetime
+from datetime import timezone
+from pyramid.httpexceptions import HTTPBadRequest
 from pyramid.httpexceptions import HTTPForbidden
+from pyramid.httpexceptions import HTTPNotFound
+from pyramid.httpexceptions import HTTPNotModified
 from pyramid.interfaces import IAuthenticationPolicy
 from pyramid.interfaces import IAuthorizationPolicy
 from pyramid.interfaces import IDebugLogger
+from pyramid.location import lineage
 from pyramid.security import ALL_PERMISSIONS
 from pyramid.security import ACLDenied
 from pyramid.security import Allow
 from pyramid.security import Deny
 from pyramid.security import Everyone
 from pyramid.security import view_execution_permitted
+from pyramid.threadlocal import get_current_request
+from pyramid.traversal import find_resource
+from webob.acceptparse import create_accept_header
 from webob.exc import HTTPFound
+from unittest import mock
 from webob.response import Response
 from zope.component import ComponentLookupError
-import sys
+from zope.interface import Interface
+from zope.interface import alsoProvides
+from zope.interface import implementer
+from zope.interface import providedBy
+from zope.interface.interfaces import IObjectEvent
+from zope.interface.interfaces import ObjectEvent
+import asyncio
 import doctest
+import gc
+import gzip
+import json
+import sys
+import threading
+import time
 import unittest
 import venusian
+import warnings
 
 
 class DummyVenusian(object):
@@ -75,8 +130,8 @@ class TileTestLayer(object):
         tile.venusian = venusian
         self.registry.unregisterUtility(self.logger, IDebugLogger)
 
-    def new_request(self):
-        return testing.DummyRequest()
+    def new_request(self, **kw):
+        return testing.DummyRequest(**kw)
 
 
 class Example(object):
@@ -230,6 +285,503 @@ class TestTile(TileTestCase):
             u'<span>Tile One</span>'
         )
 
+    def test_tile_per_call(self):
+        # Registered tile acts as prototype, each rendering happens on a
+        # dedicated copy of it
+        @tile(name='percalltile', permission=None)
+        class PerCallTile(Tile):
+            instances = []
+
+            def prepare(self):
+                self.instances.append(self)
+                self.data = self.model.__name__
+
+            def render(self):
+                # give other threads the chance to overwrite state if shared
+                time.sleep(0.001)
+                return u'<span>{}</span>'.format(self.data)
+
+        request = self.layer.new_request()
+        models = [Model(__name__='m{}'.format(i)) for i in range(8)]
+        results = {}
+
+        def render(model):
+            results[model.__name__] = render_tile(model, request, 'percalltile')
+
+        threads = [threading.Thread(target=render, args=(m,)) for m in models]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for model in models:
+            self.assertEqual(
+                results[model.__name__],
+                u'<span>{}</span>'.format(model.__name__)
+            )
+        self.assertEqual(len(set(map(id, PerCallTile.instances))), 8)
+        for instance in PerCallTile.instances:
+            self.assertEqual(instance.name, 'percalltile')
+
+        # Tile implementations not based on ``Tile`` are called directly
+        class SlotsTile(object):
+            __slots__ = ()
+
+            def __call__(self, model, request):
+                return u'<span>Slots</span>'
+
+        slots_tile = SlotsTile()
+        self.assertTrue(_bind_tile(slots_tile) is slots_tile)
+
+        # Function tile factories
+        def fn_tile(path=None, attribute=None, name=None):
+            def render(model, request):
+                return u'<span>fn</span>'
+            return render
+
+        register_tile(name='fntile', class_=fn_tile, permission=None)
+        self.assertEqual(
+            render_tile(Model(), request, 'fntile'),
+            u'<span>fn</span>'
+        )
+
+    def test_render_tiles(self):
+        model = Model()
+        request = self.layer.new_request()
+
+        register_tile(name='tileone', path='../testdata/tile1.pt')
+
+        @tile(name='modelname')
+        class ModelNameTile(Tile):
+            def render(self):
+                return u'<span>{}</span>'.format(self.model.__name__)
+
+        other = Model(__name__='other')
+        rendered = render_tiles(
+            model,
+            request,
+            ['tileone', ('modelname', other), 'inexistent']
+        )
+        self.assertEqual(
+            list(rendered.keys()),
+            ['tileone', ('modelname', other), 'inexistent']
+        )
+        self.assertEqual(rendered['tileone'], u'<span>Tile One</span>')
+        self.assertEqual(
+            rendered[('modelname', other)],
+            u'<span>other</span>'
+        )
+        self.assertTrue(rendered['inexistent'].startswith(
+            u"Tile with name 'inexistent' not found"
+        ))
+
+        # Same tile rendered on multiple models
+        a = Model(__name__='a')
+        b = Model(__name__='b')
+        rendered = render_tiles(
+            model,
+            request,
+            (item for item in [('modelname', a), ('modelname', b)])
+        )
+        self.assertEqual(list(rendered.items()), [
+            (('modelname', a), u'<span>a</span>'),
+            (('modelname', b), u'<span>b</span>')
+        ])
+        rendered = asyncio.run(render_tiles_async(
+            model,
+            request,
+            [('modelname', a), ('modelname', b)]
+        ))
+        self.assertEqual(list(rendered.items()), [
+            (('modelname', a), u'<span>a</span>'),
+            (('modelname', b), u'<span>b</span>')
+        ])
+
+        self.expectError(
+            ComponentLookupError,
+            render_tiles,
+            model,
+            request,
+            ['tileone', 'inexistent'],
+            catch_errors=False
+        )
+
+    def test_render_tiles_concurrent(self):
+        model = Model()
+        request = self.layer.new_request()
+        barrier = threading.Barrier(2, timeout=5)
+
+        @tile(name='independent_a', independent=True)
+        class IndependentA(Tile):
+            def prepare(self):
+                # blocks until ``independent_b`` is prepared concurrently
+                barrier.wait()
+                self.current = get_current_request()
+
+            def render(self):
+                return u'<span>A {}</span>'.format(self.current is self.request)
+
+        @tile(name='independent_b', independent=True)
+        class IndependentB(Tile):
+            def prepare(self):
+                barrier.wait()
+
+            def render(self):
+                return u'<span>B</span>'
+
+        @tile(name='dependent')
+        class Dependent(Tile):
+            def render(self):
+                return u'<span>C</span>'
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            rendered = render_tiles(
+                model,
+                request,
+                ['independent_a', 'dependent', 'independent_b'],
+                executor=executor
+            )
+        self.assertEqual(list(rendered.items()), [
+            ('independent_a', u'<span>A True</span>'),
+            ('dependent', u'<span>C</span>'),
+            ('independent_b', u'<span>B</span>')
+        ])
+
+        # Independent tile rendered on multiple models
+        @tile(name='independent_name', independent=True)
+        class IndependentName(Tile):
+            def render(self):
+                return u'<span>{}</span>'.format(self.model.__name__)
+
+        a = Model(__name__='a')
+        b = Model(__name__='b')
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            rendered = render_tiles(
+                model,
+                request,
+                [
+                    ('independent_name', a),
+                    ('independent_name', b),
+                    'dependent'
+                ],
+                executor=executor
+            )
+        self.assertEqual(list(rendered.items()), [
+            (('independent_name', a), u'<span>a</span>'),
+            (('independent_name', b), u'<span>b</span>'),
+            ('dependent', u'<span>C</span>')
+        ])
+
+        # Redirect triggered by any tile results in empty strings
+        @tile(name='independent_redirect', independent=True)
+        class IndependentRedirect(Tile):
+            def render(self):
+                self.redirect('http://example.com')
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            rendered = render_tiles(
+                model,
+                request,
+                ['dependent', 'independent_redirect'],
+                executor=executor
+            )
+        self.assertEqual(rendered, {
+            'dependent': u'',
+            'independent_redirect': u''
+        })
+        self.assertEqual(request.environ['redirect'], 'http://example.com')
+        del request.environ['redirect']
+
+    def test_render_tile_async(self):
+        model = Model()
+        request = self.layer.new_request()
+
+        @tile(name='async_prepare')
+        class AsyncPrepare(Tile):
+            path = 'cone.tile:testdata/tile2.pt'
+
+            async def prepare(self):
+                await asyncio.sleep(0)
+                self.data = u'async'
+
+        @tile(name='async_render')
+        class AsyncRender(Tile):
+            async def render(self):
+                await asyncio.sleep(0)
+                return u'<span>Async Render</span>'
+
+        @tile(name='async_both', permission=None)
+        class AsyncBoth(Tile):
+            async def prepare(self):
+                self.data = u'both'
+
+            async def render(self):
+                return u'<span>{}</span>'.format(self.data)
+
+        @tile(name='async_hidden')
+        class AsyncHidden(Tile):
+            show = False
+
+            async def prepare(self):
+                pass
+
+        register_tile(name='tileone', path='../testdata/tile1.pt')
+
+        self.assertEqual(
+            asyncio.run(render_tile_async(model, request, 'async_prepare')),
+            (
+                u'<span>Tile Two: <b><span>Tile One</span></b>'
+                u'</span>\n<span>async</span>'
+            )
+        )
+        self.assertEqual(
+            asyncio.run(render_tile_async(model, request, 'async_render')),
+            u'<span>Async Render</span>'
+        )
+        self.assertEqual(
+            asyncio.run(render_tile_async(model, request, 'async_both')),
+            u'<span>both</span>'
+        )
+        self.assertEqual(
+            asyncio.run(render_tile_async(model, request, 'async_hidden')),
+            u''
+        )
+
+        # Synchronous tiles are rendered directly
+        self.assertEqual(
+            asyncio.run(render_tile_async(model, request, 'tileone')),
+            u'<span>Tile One</span>'
+        )
+
+        # Lookup errors
+        self.assertTrue(
+            asyncio.run(render_tile_async(model, request, 'inexistent'))
+            .startswith(u"Tile with name 'inexistent' not found")
+        )
+        self.expectError(
+            ComponentLookupError,
+            asyncio.run,
+            render_tile_async(model, request, 'inexistent', catch_errors=False)
+        )
+
+        # Asynchronous tiles can not be rendered synchronously
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            err = self.expectError(
+                RuntimeError,
+                render_tile,
+                model,
+                request,
+                'async_render'
+            )
+            gc.collect()
+        self.assertEqual(str(err), (
+            'Tile ``async_render`` renders asynchronously. '
+            'Use ``render_tile_async`` instead.'
+        ))
+
+        # Output of asynchronous tiles gets cached
+        backend = MemoryTileCache()
+
+        @tile(name='async_cached', cache=CachePolicy(backend=backend))
+        class AsyncCached(Tile):
+            async def render(self):
+                return u'<span>Cached</span>'
+
+        self.assertEqual(
+            asyncio.run(render_tile_async(model, request, 'async_cached')),
+            u'<span>Cached</span>'
+        )
+        self.assertEqual(list(backend._data.values())[0][1], u'<span>Cached</span>')
+        self.assertEqual(
+            asyncio.run(render_tile_async(model, request, 'async_cached')),
+            u'<span>Cached</span>'
+        )
+
+        # Redirect
+        @tile(name='async_redirect')
+        class AsyncRedirect(Tile):
+            async def render(self):
+                self.redirect('http://example.com')
+                return u'redirect'
+
+        self.assertEqual(
+            asyncio.run(render_tile_async(model, request, 'async_redirect')),
+            u''
+        )
+        del request.environ['redirect']
+
+    def test_render_tiles_async(self):
+        model = Model()
+        request = self.layer.new_request()
+        started = []
+
+        @tile(name='async_a')
+        class AsyncA(Tile):
+            async def render(self):
+                started.append('a')
+                # yield to event loop, ``async_b`` starts before ``a`` ends
+                await asyncio.sleep(0.01)
+                return u'<span>A {}</span>'.format(started)
+
+        @tile(name='async_b')
+        class AsyncB(Tile):
+            async def render(self):
+                started.append('b')
+                await asyncio.sleep(0)
+                return u'<span>B</span>'
+
+        register_tile(name='tileone', path='../testdata/tile1.pt')
+
+        rendered = asyncio.run(render_tiles_async(
+            model,
+            request,
+            ['async_a', 'tileone', 'async_b']
+        ))
+        self.assertEqual(list(rendered.items()), [
+            ('async_a', u"<span>A ['a', 'b']</span>"),
+            ('tileone', u'<span>Tile One</span>'),
+            ('async_b', u'<span>B</span>')
+        ])
+
+        @tile(name='async_redirect_b')
+        class AsyncRedirectB(Tile):
+            async def render(self):
+                self.redirect('http://example.com')
+
+        rendered = asyncio.run(render_tiles_async(
+            model,
+            request,
+            ['tileone', 'async_redirect_b']
+        ))
+        self.assertEqual(rendered, {'tileone': u'', 'async_redirect_b': u''})
+        del request.environ['redirect']
+
+    def test_tile_index(self):
+        model = Model()
+        request = self.layer.new_request()
+        registry = self.layer.registry
+
+        register_tile(name='indexedtile', path='../testdata/tile1.pt')
+        index = _tile_index(registry)
+        found, missing = index[1], index[2]
+        self.assertFalse(any(key[2] == 'indexedtile' for key in found))
+
+        # Tile factory gets indexed on first lookup
+        factory = _lookup_tile(model, request, 'indexedtile')
+        key = (providedBy(model), providedBy(request), 'indexedtile')
+        self.assertTrue(found[key] is factory)
+
+        # Further lookups are served from index
+        with mock.patch.object(registry.adapters, 'lookup') as lookup:
+            self.assertTrue(
+                _lookup_tile(model, request, 'indexedtile') is factory
+            )
+            self.assertFalse(lookup.called)
+
+        # Missing tiles are indexed as well
+        self.assertIsNone(_lookup_tile(model, request, 'inexistent'))
+        key = (providedBy(model), providedBy(request), 'inexistent')
+        self.assertTrue(key in missing)
+        with mock.patch.object(registry.adapters, 'lookup') as lookup:
+            self.assertIsNone(_lookup_tile(model, request, 'inexistent'))
+            self.assertFalse(has_tile(model, request, 'inexistent'))
+            self.assertTrue(has_tile(model, request, 'indexedtile'))
+            self.assertFalse(lookup.called)
+
+        # Missing tiles index is bounded
+        with mock.patch('cone.tile._api.MISSING_INDEX_SIZE', 1):
+            _lookup_tile(model, request, 'inexistent_2')
+        self.assertEqual(list(missing), [
+            (providedBy(model), providedBy(request), 'inexistent_2')
+        ])
+
+        # Index gets reset if tiles get registered
+        register_tile(name='indexedtile', path='../testdata/tile1_override.pt')
+        self.assertFalse(_tile_index(registry) is index)
+        self.assertFalse(_lookup_tile(model, request, 'indexedtile') is factory)
+        self.assertEqual(
+            render_tile(model, request, 'indexedtile'),
+            u'<span>Tile One Override</span>'
+        )
+        self.assertFalse(has_tile(model, request, 'formerlymissing'))
+        register_tile(name='formerlymissing', path='../testdata/tile1.pt')
+        self.assertTrue(has_tile(model, request, 'formerlymissing'))
+
+    def test_register_tiles(self):
+        model = Model()
+        request = self.layer.new_request()
+
+        class BulkTile(Tile):
+            def render(self):
+                return u'<span>Bulk</span>'
+
+        register_tiles([
+            dict(name='bulk_template', path='../testdata/tile1.pt'),
+            dict(name='bulk_attr', class_=BulkTile, permission=None),
+        ])
+        self.assertEqual(
+            render_tiles(model, request, ['bulk_template', 'bulk_attr']),
+            {
+                'bulk_template': u'<span>Tile One</span>',
+                'bulk_attr': u'<span>Bulk</span>'
+            }
+        )
+
+    def test_scan_registration(self):
+        model = Model()
+        request = self.layer.new_request()
+        config = Configurator(registry=self.layer.registry)
+
+        class ScanContext(object):
+            pass
+
+        context = ScanContext()
+        context.config = config
+
+        class ScanVenusian(object):
+            def attach(self, wrapped, callback, category=None, depth=1):
+                callback(context, None, wrapped)
+
+        tile.venusian = ScanVenusian()
+        try:
+            with mock.patch.object(
+                self.layer.registry,
+                'queryUtility',
+                wraps=self.layer.registry.queryUtility
+            ) as query:
+                @tile(name='scanned_a')
+                class ScannedA(Tile):
+                    def render(self):
+                        return u'<span>A</span>'
+
+                @tile(name='scanned_b', path='../testdata/tile1.pt')
+                class ScannedB(Tile):
+                    pass
+
+                # Security policies are looked up once per scan
+                self.assertEqual(query.call_count, 2)
+        finally:
+            tile.venusian = DummyVenusian()
+
+        # Scanned tiles get registered in scan order
+        self.assertEqual(
+            render_tile(model, request, 'scanned_a'),
+            u'<span>A</span>'
+        )
+        self.assertEqual(
+            render_tile(model, request, 'scanned_b'),
+            u'<span>Tile One</span>'
+        )
+
+        # Tiles registered after scan override scanned tiles
+        class Override(Tile):
+            def render(self):
+                return u'override'
+
+        register_tile(name='scanned_a', class_=Override)
+        config.commit()
+        self.assertEqual(render_tile(model, request, 'scanned_a'), u'override')
+
     def test_override_tile(self):
         model = Model()
         request = self.layer.new_request()
@@ -265,18 +817,29 @@ class TestTile(TileTestCase):
         self.layer.logger.clear()
 
         # By default, render error message if tile ComponentLookupError
+        # Lookup error refers to interfaces provided by model and request
         self.checkOutput(
-            "Tile with name 'inexistent' not found:<br /><pre>((&lt;cone.tile." +
-            "tests.test_tile.Model ... at ...&gt;, &lt;pyramid.testing." +
-            "DummyRequest object at ...&gt;), &lt;InterfaceClass cone.tile." +
-            "_api.ITile&gt;, ...inexistent...)</pre>",
+            "Tile with name 'inexistent' not found:<br /><pre>((" +
+            "classImplements(Model), classImplements(DummyRequest, " +
+            "IRequest)), &lt;InterfaceClass cone.tile._api.ITile&gt;, " +
+            "&#x27;inexistent&#x27;)</pre>",
         render_tile(model, request, 'inexistent'))
         self.checkOutput(
-            "Error in rendering_tile: ((<cone.tile.tests.test_tile.Model ... at ...>, " +
-            "<pyramid.testing.DummyRequest object at ...>), " +
+            "Error in rendering_tile: ((classImplements(Model), " +
+            "classImplements(DummyRequest, IRequest)), " +
             "<InterfaceClass cone.tile._api.ITile>, 'inexistent')",
         self.layer.logger.messages[0])
 
+        # Error message is kept in missing tiles index
+        with mock.patch('cone.tile._api.ComponentLookupError') as error:
+            self.assertTrue(render_tile(
+                Model(),
+                self.layer.new_request(),
+                'inexistent'
+            ).startswith("Tile with name 'inexistent' not found"))
+            self.assertFalse(error.called)
+        self.assertEqual(len(self.layer.logger.messages), 2)
+
         self.layer.logger.clear()
 
         # To change the above behavior, the ``catch_errors`` argument can be
@@ -409,6 +972,73 @@ class TestTile(TileTestCase):
         self.assertEqual(request.environ['redirect'], 'http://example.com/foo')
         del request.environ['redirect']
 
+    def test_redirect_short_circuit(self):
+        # Once a redirect has been triggered, following tiles are neither
+        # prepared nor rendered
+        model = Model()
+        request = self.layer.new_request()
+        called = []
+
+        @tile(name='shortcircuit_redirect')
+        class ShortCircuitRedirectTile(Tile):
+            def render(self):
+                called.append('redirect')
+                self.redirect('http://example.com')
+
+        @tile(name='shortcircuit_skipped')
+        class ShortCircuitSkippedTile(Tile):
+            def prepare(self):
+                called.append('prepare')
+
+            def render(self):
+                called.append('render')
+                return u'skipped'
+
+        rendered = render_tiles(
+            model,
+            request,
+            ['shortcircuit_redirect', 'shortcircuit_skipped']
+        )
+        self.assertEqual(rendered, {
+            'shortcircuit_redirect': u'',
+            'shortcircuit_skipped': u''
+        })
+        self.assertEqual(called, ['redirect'])
+
+        # Also applies to tiles called directly
+        self.assertEqual(ShortCircuitSkippedTile()(model, request), u'')
+        self.assertEqual(called, ['redirect'])
+        del request.environ['redirect']
+
+        # Redirect triggered in prepare skips rendering of the tile itself
+        @tile(name='shortcircuit_prepare')
+        class ShortCircuitPrepareTile(Tile):
+            def prepare(self):
+                self.redirect('http://example.com')
+
+            def render(self):
+                called.append('render')
+                return u'rendered'
+
+        self.assertEqual(
+            render_tile(model, request, 'shortcircuit_prepare'),
+            u''
+        )
+        self.assertEqual(called, ['redirect'])
+        del request.environ['redirect']
+
+        # Applies to async rendering
+        self.assertEqual(
+            asyncio.run(render_tiles_async(
+                model,
+                request,
+                ['shortcircuit_redirect', 'shortcircuit_skipped']
+            )),
+            {'shortcircuit_redirect': u'', 'shortcircuit_skipped': u''}
+        )
+        self.assertEqual(called, ['redirect', 'redirect'])
+        del request.environ['redirect']
+
     def test_render_template(self):
         model = Model()
         request = self.layer.new_request()
@@ -465,6 +1095,24 @@ class TestTile(TileTestCase):
 
         del request.environ['redirect']
 
+    def test_template_renderer(self):
+        registry = self.layer.registry
+        path = 'cone.tile:testdata/tile1.pt'
+
+        # Renderers are memoized per template path
+        renderer = _template_renderer(path, registry)
+        self.assertTrue(_template_renderer(path, registry) is renderer)
+        self.assertTrue(registry._cone_tile_renderers[path] is renderer)
+
+        # Renderers are not memoized if templates get reloaded
+        registry.settings['reload_templates'] = 'true'
+        try:
+            del registry._cone_tile_renderers[path]
+            _template_renderer(path, registry)
+            self.assertFalse(path in registry._cone_tile_renderers)
+        finally:
+            del registry.settings['reload_templates']
+
     def test_render_template_to_response(self):
         model = Model()
         request = self.layer.new_request()
@@ -526,6 +1174,89 @@ class TestTile(TileTestCase):
         self.assertTrue(isinstance(response, HTTPFound))
         del request.environ['redirect']
 
+    def test_stream_tiles_to_response(self):
+        model = Model()
+        request = self.layer.new_request()
+        rendered = []
+
+        @tile(name='stream_head', permission=None)
+        class StreamHead(Tile):
+            def render(self):
+                rendered.append('head')
+                return u'<head>\xe4</head>'
+
+        @tile(name='stream_body', permission=None)
+        class StreamBody(Tile):
+            def render(self):
+                rendered.append('body')
+                current = get_current_request() is self.request
+                return u'<body>{}</body>'.format(current)
+
+        response = stream_tiles_to_response(
+            model,
+            request,
+            ['stream_head', 'stream_body']
+        )
+        self.assertTrue(isinstance(response, Response))
+        # Only leading tiles are rendered eagerly
+        self.assertEqual(rendered, ['head'])
+        chunks = list(response.app_iter)
+        self.assertEqual(chunks, [
+            u'<head>\xe4</head>'.encode('utf-8'),
+            b'<body>True</body>'
+        ])
+        self.assertEqual(rendered, ['head', 'body'])
+        self.assertIsNone(get_current_request())
+
+        # Redirect while rendering leading tiles
+        @tile(name='stream_redirect', permission=None)
+        class StreamRedirect(Tile):
+            def render(self):
+                self.redirect('http://example.com')
+
+        response = stream_tiles_to_response(
+            model,
+            request,
+            ['stream_redirect', 'stream_body']
+        )
+        self.assertTrue(isinstance(response, HTTPFound))
+        self.assertEqual(response.location, 'http://example.com')
+
+        request.environ['redirect'] = None
+        register_tile(name='redirecttiletwo', path='../testdata/tile3.pt')
+        response = stream_tiles_to_response(
+            model,
+            request,
+            ['stream_head', 'redirecttiletwo'],
+            eager=2
+        )
+        self.assertTrue(isinstance(response, HTTPFound))
+        self.assertEqual(response.location, 'http://example.com/foo')
+
+        # Redirect after response started streaming aborts rendering
+        self.layer.logger.clear()
+        del rendered[:]
+        response = stream_tiles_to_response(
+            model,
+            request,
+            ['stream_head', 'stream_redirect', 'stream_body']
+        )
+        self.assertEqual(list(response.app_iter), [
+            u'<head>\xe4</head>'.encode('utf-8')
+        ])
+        self.assertEqual(rendered, ['head'])
+        self.assertEqual(self.layer.logger.messages, [
+            u"Redirect triggered by tile 'stream_redirect' after response "
+            u"started streaming. Abort rendering."
+        ])
+        del request.environ['redirect']
+
+        # Empty tiles
+        response = stream_tiles_to_response(model, request, ['stream_head'])
+        self.assertEqual(list(response.app_iter), [
+            u'<head>\xe4</head>'.encode('utf-8')
+        ])
+
     def test_render_to_response(self):
         request = self.layer.new_request()
 
@@ -541,27 +1272,1224 @@ class TestTile(TileTestCase):
         self.assertTrue(request.environ['redirect'] is response)
         del request.environ['redirect']
 
-    def test_nodeurl(self):
+    def test_check_freshness(self):
         model = Model()
-        request = self.layer.new_request()
+        modified = datetime(2026, 1, 1, 12, 0, 0)
+        prepared = []
 
-        register_tile(name='urltile', path='../testdata/tile4.pt')
+        @tile(
+            name='fresh_a',
+            permission=None,
+            freshness=lambda model, request: modified)
+        class FreshA(Tile):
+            def prepare(self):
+                prepared.append('a')
+
+            def render(self):
+                return u'<span>A</span>'
+
+        @tile(
+            name='fresh_b',
+            permission=None,
+            freshness=lambda model, request: modified.replace(hour=10))
+        class FreshB(Tile):
+            def render(self):
+                return u'<span>B</span>'
+
+        @tile(
+            name='fresh_version',
+            permission=None,
+            freshness=lambda model, request: getattr(model, 'version', None))
+        class FreshVersion(Tile):
+            def render(self):
+                return u'<span>Version</span>'
+
+        @tile(name='not_fresh', permission=None)
+        class NotFresh(Tile):
+            def render(self):
+                return u'<span>Not fresh</span>'
+
+        # Freshness headers are set on response
+        request = self.layer.new_request()
+        self.assertIsNone(
+            check_freshness(model, request, ['fresh_a', 'fresh_b'])
+        )
+        etag, last_modified = request.environ['cone.tile.freshness']
+        self.assertTrue(etag.startswith('W/"'))
         self.assertEqual(
-            render_tile(model, request, 'urltile'),
-            u'<span>http://example.com</span>\n'
+            last_modified,
+            datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
         )
-
-        model.path = [None, 'foo']
+        response = render_template_to_response(
+            'cone.tile:testdata/tile1.pt',
+            model=model,
+            request=request
+        )
+        self.assertEqual(response.headers['ETag'], etag)
         self.assertEqual(
-            render_tile(model, request, 'urltile'),
-            u'<span>http://example.com/foo</span>\n'
+            response.headers['Last-Modified'],
+            'Thu, 01 Jan 2026 12:00:00 GMT'
         )
-
-        model.path = [None, 'foo', 'bar/baz']
+        response = render_to_response(request, u'result')
+        self.assertEqual(response.headers['ETag'], etag)
+        response = stream_tiles_to_response(model, request, ['fresh_a'])
+        self.assertEqual(response.headers['ETag'], etag)
         self.assertEqual(
-            render_tile(model, request, 'urltile'),
-            u'<span>http://example.com/foo/bar__s_l_a_s_h__baz</span>\n'
+            response.headers['Last-Modified'],
+            'Thu, 01 Jan 2026 12:00:00 GMT'
         )
+        del prepared[:]
+
+        # Matching ETag, no tile gets rendered
+        request = self.layer.new_request()
+        request.headers['If-None-Match'] = '"other", {}'.format(etag)
+        response = check_freshness(model, request, ['fresh_a', 'fresh_b'])
+        self.assertTrue(isinstance(response, HTTPNotModified))
+        self.assertEqual(response.headers['ETag'], etag)
+        self.assertEqual(prepared, [])
+
+        # Weak comparison
+        request = self.layer.new_request()
+        request.headers['If-None-Match'] = etag[2:]
+        response = check_freshness(model, request, ['fresh_a', 'fresh_b'])
+        self.assertTrue(isinstance(response, HTTPNotModified))
+
+        # ETag not matching, If-Modified-Since ignored
+        request = self.layer.new_request()
+        request.headers['If-None-Match'] = '"other"'
+        request.headers['If-Modified-Since'] = 'Thu, 01 Jan 2026 12:00:00 GMT'
+        self.assertIsNone(
+            check_freshness(model, request, ['fresh_a', 'fresh_b'])
+        )
+
+        # If-Modified-Since
+        request = self.layer.new_request()
+        request.headers['If-Modified-Since'] = 'Thu, 01 Jan 2026 12:00:00 GMT'
+        response = check_freshness(model, request, ['fresh_a', 'fresh_b'])
+        self.assertTrue(isinstance(response, HTTPNotModified))
+        request = self.layer.new_request()
+        request.headers['If-Modified-Since'] = 'Thu, 01 Jan 2026 11:00:00 GMT'
+        self.assertIsNone(
+            check_freshness(model, request, ['fresh_a', 'fresh_b'])
+        )
+
+        # ETag changes with model version, no Last-Modified for versions
+        model.version = 1
+        request = self.layer.new_request()
+        check_freshness(model, request, ['fresh_a', 'fresh_version'])
+        etag, last_modified = request.environ['cone.tile.freshness']
+        self.assertIsNone(last_modified)
+        model.version = 2
+        request = self.layer.new_request()
+        request.headers['If-None-Match'] = etag
+        self.assertIsNone(
+            check_freshness(model, request, ['fresh_a', 'fresh_version'])
+        )
+        response = render_to_response(request, u'result')
+        self.assertFalse('Last-Modified' in response.headers)
+
+        # Unknown freshness
+        del model.version
+        request = self.layer.new_request()
+        self.assertIsNone(
+            check_freshness(model, request, ['fresh_a', 'fresh_version'])
+        )
+        self.assertIsNone(request.environ['cone.tile.freshness'])
+        self.assertIsNone(
+            check_freshness(model, request, ['fresh_a', 'not_fresh'])
+        )
+        self.assertIsNone(
+            check_freshness(model, request, ['fresh_a', 'inexistent'])
+        )
+        response = render_to_response(request, u'result')
+        self.assertFalse('ETag' in response.headers)
+
+    @secured
+    def test_check_freshness_principals(self, authn):
+        @tile(
+            name='fresh_secured',
+            freshness=lambda model, request: 1)
+        class FreshSecured(Tile):
+            def render(self):
+                return u'<span>Secured</span>'
+
+        model = Model()
+        authn.unauthenticated_userid = lambda *args: 'max'
+        request = self.layer.new_request()
+        check_freshness(model, request, ['fresh_secured'])
+        etag = request.environ['cone.tile.freshness'][0]
+
+        # ETag varies by effective principals
+        authn.unauthenticated_userid = lambda *args: 'editor_user'
+        request = self.layer.new_request()
+        request.headers['If-None-Match'] = etag
+        self.assertIsNone(check_freshness(model, request, ['fresh_secured']))
+        self.assertNotEqual(request.environ['cone.tile.freshness'][0], etag)
+
+    @secured
+    def test_deferred(self, authn):
+        model = Model()
+        model.path = [None, 'foo']
+        model.__acl__ = [
+            (Allow, 'system.Authenticated', ['view']),
+            (Deny, Everyone, ALL_PERMISSIONS),
+        ]
+        request = self.layer.new_request()
+        authn.unauthenticated_userid = lambda *args: 'max'
+
+        @tile(name='deferred_ajax', defer=True)
+        class DeferredAjax(Tile):
+            def render(self):
+                return u'<span>Deferred</span>'
+
+        @tile(name='deferred_esi', defer='esi', permission=None)
+        class DeferredEsi(Tile):
+            def render(self):
+                return u'<span>ESI</span>'
+
+        register_tile(name='tileone', path='../testdata/tile1.pt')
+
+        err = self.expectError(
+            ValueError,
+            register_tile,
+            name='deferred_invalid',
+            defer='invalid'
+        )
+        self.assertEqual(str(err), 'Invalid ``defer`` value: invalid')
+
+        self.assertEqual(
+            deferred_tile_url(model, request, 'deferred_ajax'),
+            'http://example.com/foo/deferred_tile?name=deferred_ajax'
+        )
+
+        # Tile renderer renders placeholders for deferred tiles
+        renderer = TileRenderer(model, request)
+        self.assertEqual(renderer('deferred_ajax'), (
+            u'<div class="deferred-tile" data-tile="deferred_ajax" '
+            u'data-tile-url="http://example.com/foo/deferred_tile?'
+            u'name=deferred_ajax"></div>'
+        ))
+        self.assertEqual(renderer('deferred_esi'), (
+            u'<esi:include src="http://example.com/foo/deferred_tile?'
+            u'name=deferred_esi" />'
+        ))
+        self.assertEqual(renderer('tileone'), u'<span>Tile One</span>')
+
+        # No placeholder if not permitted
+        authn.unauthenticated_userid = lambda *args: None
+        invalidate_security_cache(request)
+        self.assertEqual(renderer('deferred_ajax'), u'')
+
+        # Deferred tile view renders tile
+        request = self.layer.new_request(params={'name': 'deferred_esi'})
+        response = deferred_tile_view(model, request)
+        self.assertEqual(response.text, u'<span>ESI</span>')
+
+        # Security is checked by tile
+        request = self.layer.new_request(params={'name': 'deferred_ajax'})
+        self.expectError(HTTPForbidden, deferred_tile_view, model, request)
+        authn.unauthenticated_userid = lambda *args: 'max'
+        request = self.layer.new_request(params={'name': 'deferred_ajax'})
+        response = deferred_tile_view(model, request)
+        self.assertEqual(response.text, u'<span>Deferred</span>')
+
+        # Only deferred tiles are rendered
+        for params in [{}, {'name': 'tileone'}, {'name': 'inexistent'}]:
+            request = self.layer.new_request(params=params)
+            self.expectError(HTTPNotFound, deferred_tile_view, model, request)
+
+        # Register views
+        config = mock.Mock()
+        includeme(config)
+        self.assertEqual(config.add_view.call_args_list, [
+            mock.call(deferred_tile_view, name='deferred_tile'),
+            mock.call(bulk_tiles_view, name='bulk_tiles')
+        ])
+
+    @secured
+    def test_bulk_tiles_view(self, authn):
+        root = Model()
+        root.__acl__ = [
+            (Allow, 'system.Authenticated', ['view']),
+            (Deny, Everyone, ALL_PERMISSIONS),
+        ]
+        child = root['child'] = Model()
+        child.__acl__ = [(Allow, Everyone, ['view'])]
+        authn.unauthenticated_userid = lambda *args: None
+
+        @tile(name='bulk_name')
+        class BulkNameTile(Tile):
+            def render(self):
+                return u'<span>{}</span>'.format(self.model.__name__)
+
+        # Invalid request
+        for params in [{}, {'tiles': 'invalid'}, {'tiles': '[1]'}]:
+            request = self.layer.new_request(params=params, json_body=None)
+            self.expectError(HTTPBadRequest, bulk_tiles_view, root, request)
+
+        # JSON response
+        tiles = [
+            ['child', 'bulk_name'],
+            ['/child', 'bulk_name'],
+            ['', 'bulk_name'],
+            ['child', 'inexistent'],
+            ['inexistent', 'bulk_name']
+        ]
+        request = self.layer.new_request(json_body=tiles)
+        with mock.patch(
+            'cone.tile._view.find_resource',
+            side_effect=find_resource
+        ) as traverse:
+            response = bulk_tiles_view(root, request)
+            # each model gets traversed once
+            self.assertEqual(traverse.call_count, 4)
+        self.assertEqual(response.content_type, 'application/json')
+        self.assertEqual(response.json_body, {'tiles': [{
+            'path': 'child',
+            'name': 'bulk_name',
+            'html': '<span>child</span>',
+            'error': None
+        }, {
+            'path': '/child',
+            'name': 'bulk_name',
+            'html': '<span>child</span>',
+            'error': None
+        }, {
+            'path': '',
+            'name': 'bulk_name',
+            'html': '',
+            'error': 'forbidden'
+        }, {
+            'path': 'child',
+            'name': 'inexistent',
+            'html': '',
+            'error': 'not found'
+        }, {
+            'path': 'inexistent',
+            'name': 'bulk_name',
+            'html': '',
+            'error': 'not found'
+        }]})
+
+        # Security results are shared between the tiles
+        request = self.layer.new_request(params={
+            'tiles': json.dumps([['child', 'bulk_name'], ['child', 'bulk_name']])
+        })
+        with mock.patch.object(
+            authn,
+            'effective_principals',
+            wraps=authn.effective_principals
+        ) as principals:
+            bulk_tiles_view(root, request)
+            self.assertEqual(principals.call_count, 1)
+
+        # Multipart response
+        request = self.layer.new_request(json_body=[
+            ['child', 'bulk_name'],
+            ['child', 'inexistent']
+        ])
+        request.accept = create_accept_header('multipart/mixed')
+        with mock.patch('cone.tile._view.uuid.uuid4') as uuid4:
+            uuid4.return_value.hex = 'boundary'
+            response = bulk_tiles_view(root, request)
+        self.assertEqual(
+            response.headers['Content-Type'],
+            'multipart/mixed; boundary=boundary'
+        )
+        self.assertEqual(response.body.decode('utf-8'), (
+            '--boundary\r\n'
+            'Content-Type: text/html; charset=utf-8\r\n'
+            'X-Tile-Path: "child"\r\n'
+            'X-Tile-Name: "bulk_name"\r\n'
+            '\r\n'
+            '<span>child</span>\r\n'
+            '--boundary\r\n'
+            'Content-Type: text/html; charset=utf-8\r\n'
+            'X-Tile-Path: "child"\r\n'
+            'X-Tile-Name: "inexistent"\r\n'
+            'X-Tile-Error: not found\r\n'
+            '\r\n'
+            '\r\n'
+            '--boundary--\r\n'
+        ))
+
+        # Tiles registered without permission are not accessible by URL
+        @tile(name='bulk_internal', permission=None)
+        class BulkInternalTile(Tile):
+            def render(self):
+                return u'internal'
+
+        request = self.layer.new_request(json_body=[
+            ['child', 'bulk_internal'],
+            ['child', 'bulk_name']
+        ])
+        response = bulk_tiles_view(root, request)
+        self.assertEqual(response.json_body, {'tiles': [{
+            'path': 'child',
+            'name': 'bulk_internal',
+            'html': '',
+            'error': 'not found'
+        }, {
+            'path': 'child',
+            'name': 'bulk_name',
+            'html': '<span>child</span>',
+            'error': None
+        }]})
+
+        # Redirect
+        @tile(name='bulk_redirect')
+        class BulkRedirectTile(Tile):
+            def render(self):
+                self.redirect('http://example.com')
+
+        tiles = [['child', 'bulk_redirect'], ['child', 'bulk_name']]
+        request = self.layer.new_request(json_body=tiles)
+        response = bulk_tiles_view(root, request)
+        self.assertEqual(response.json_body, {'redirect': 'http://example.com'})
+
+        request = self.layer.new_request(json_body=tiles)
+        request.accept = create_accept_header('multipart/mixed')
+        response = bulk_tiles_view(root, request)
+        self.assertTrue(isinstance(response, HTTPFound))
+        self.assertEqual(response.location, 'http://example.com')
+
+    def test_timeout(self):
+        model = Model()
+        request = self.layer.new_request()
+        logger = self.layer.logger
+        logger.clear()
+        release = threading.Event()
+
+        err = self.expectError(
+            ValueError,
+            register_tile,
+            name='invalidtimeout',
+            timeout=0
+        )
+        self.assertEqual(str(err), 'Invalid ``timeout`` value: 0')
+
+        @tile(name='fasttile', permission=None, timeout=5)
+        class FastTile(Tile):
+            def render(self):
+                # rendered in worker thread with request pushed to threadlocals
+                return u'<span>{}</span>'.format(
+                    get_current_request() is self.request)
+
+        self.assertEqual(
+            render_tile(model, request, 'fasttile'),
+            u'<span>True</span>'
+        )
+        self.assertEqual(logger.messages, [])
+
+        # Fallback content is rendered if time budget is exceeded
+        @tile(name='slowtile', permission=None, timeout=0.01,
+              fallback=u'<span>Fallback</span>')
+        class SlowTile(Tile):
+            def render(self):
+                release.wait(5)
+                return u'<span>Slow</span>'
+
+        self.assertEqual(
+            render_tile(model, request, 'slowtile'),
+            u'<span>Fallback</span>'
+        )
+        self.assertEqual(logger.messages, [
+            u"Tile 'slowtile' exceeded time budget of 0.01 seconds. "
+            u"Render fallback."
+        ])
+        logger.clear()
+
+        # Fallback callable
+        @tile(name='slowcallable', permission=None, timeout=0.01,
+              fallback=lambda model, request: u'<span>Callable</span>')
+        class SlowCallableTile(SlowTile):
+            pass
+
+        self.assertEqual(
+            render_tile(model, request, 'slowcallable'),
+            u'<span>Callable</span>'
+        )
+
+        # No fallback renders empty string
+        @tile(name='slownofallback', permission=None, timeout=0.01)
+        class SlowNoFallbackTile(SlowTile):
+            pass
+
+        self.assertEqual(render_tile(model, request, 'slownofallback'), u'')
+
+        # Deferred tile placeholder as fallback
+        @tile(name='slowdeferred', permission=None, timeout=0.01,
+              fallback='ajax')
+        class SlowDeferredTile(SlowTile):
+            pass
+
+        self.assertEqual(
+            render_tile(model, request, 'slowdeferred'),
+            u'<div class="deferred-tile" data-tile="slowdeferred" '
+            u'data-tile-url="http://example.com/deferred_tile?'
+            u'name=slowdeferred"></div>'
+        )
+
+        # Deferred tile view ignores time budget
+        release.set()
+        request = self.layer.new_request(params={'name': 'slowdeferred'})
+        response = deferred_tile_view(model, request)
+        self.assertEqual(response.text, u'<span>Slow</span>')
+        release.clear()
+
+        # Asynchronous tiles
+        @tile(name='slowasync', permission=None, timeout=0.01,
+              fallback=u'<span>Fallback</span>')
+        class SlowAsyncTile(Tile):
+            async def render(self):
+                await asyncio.sleep(5)
+                return u'<span>Slow</span>'
+
+        request = self.layer.new_request()
+        self.assertEqual(
+            asyncio.run(render_tile_async(model, request, 'slowasync')),
+            u'<span>Fallback</span>'
+        )
+        release.set()
+        logger.clear()
+
+        # Rendering still queued when exceeding time budget gets cancelled
+        rendered = []
+
+        @tile(name='queuedtile', permission=None, timeout=0.01)
+        class QueuedTile(Tile):
+            def render(self):
+                rendered.append(self.model)
+                return u'<span>Queued</span>'
+
+        blocker = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=1)
+        executor.submit(blocker.wait, 5)
+        request = self.layer.new_request()
+        with mock.patch('cone.tile._api._timeout_executor', executor):
+            self.assertEqual(render_tile(model, request, 'queuedtile'), u'')
+        blocker.set()
+        executor.shutdown(wait=True)
+        self.assertEqual(rendered, [])
+        logger.clear()
+
+        # Redirects and memoized output of abandoned renderings are dropped
+        release.clear()
+        finished = threading.Event()
+
+        @tile(name='abandonedtile', permission=None, timeout=0.01,
+              memoize=True)
+        class AbandonedTile(Tile):
+            def render(self):
+                release.wait(5)
+                self.redirect('http://example.com/abandoned')
+                finished.set()
+                return u'<span>Abandoned</span>'
+
+        request = self.layer.new_request()
+        request.environ['redirect'] = None
+        executor = ThreadPoolExecutor(max_workers=1)
+        with mock.patch('cone.tile._api._timeout_executor', executor):
+            self.assertEqual(
+                render_tile(model, request, 'abandonedtile'),
+                u''
+            )
+        release.set()
+        executor.shutdown(wait=True)
+        self.assertTrue(finished.is_set())
+        self.assertIsNone(request.environ['redirect'])
+        self.assertEqual(request.environ.get(MEMO_KEY), None)
+        logger.clear()
+
+        # Asynchronous rendering does not block event loop while waiting for
+        # worker thread
+        release.clear()
+
+        @tile(name='waitingtile', permission=None, timeout=1)
+        class WaitingTile(Tile):
+            def render(self):
+                return u'<span>{}</span>'.format(release.wait(2))
+
+        @tile(name='releasingtile', permission=None)
+        class ReleasingTile(Tile):
+            async def render(self):
+                release.set()
+                return u'<span>Released</span>'
+
+        request = self.layer.new_request()
+        self.assertEqual(
+            asyncio.run(render_tiles_async(
+                model,
+                request,
+                ['waitingtile', 'releasingtile']
+            )),
+            {
+                'waitingtile': u'<span>True</span>',
+                'releasingtile': u'<span>Released</span>'
+            }
+        )
+        self.assertEqual(logger.messages, [])
+
+        # Size of thread pool is configurable
+        with mock.patch('cone.tile._api._timeout_executor', None):
+            registry = self.layer.registry
+            settings = registry.settings
+            registry.settings = {'cone.tile.timeout_workers': '3'}
+            try:
+                executor = _get_timeout_executor(registry)
+            finally:
+                registry.settings = settings
+            self.assertEqual(executor._max_workers, 3)
+            executor.shutdown()
+
+    def test_nodeurl(self):
+        model = Model()
+        request = self.layer.new_request()
+
+        register_tile(name='urltile', path='../testdata/tile4.pt')
+        self.assertEqual(
+            render_tile(model, request, 'urltile'),
+            u'<span>http://example.com</span>\n'
+        )
+
+        model.path = [None, 'foo']
+        self.assertEqual(
+            render_tile(model, request, 'urltile'),
+            u'<span>http://example.com/foo</span>\n'
+        )
+
+        model.path = [None, 'foo', 'bar/baz']
+        self.assertEqual(
+            render_tile(model, request, 'urltile'),
+            u'<span>http://example.com/foo/bar__s_l_a_s_h__baz</span>\n'
+        )
+
+        # Node URLs are memoized for the lifetime of the request
+        with mock.patch('cone.tile._api.quote') as quote:
+            self.assertEqual(
+                node_url(model, request),
+                u'http://example.com/foo/bar__s_l_a_s_h__baz'
+            )
+            self.assertFalse(quote.called)
+        invalidate_node_urls(request)
+        self.assertEqual(request.environ.get(NODE_URL_KEY), None)
+
+        # Memo considers application URL
+        request.application_url = 'http://example.org'
+        self.assertEqual(
+            node_url(model, request),
+            u'http://example.org/foo/bar__s_l_a_s_h__baz'
+        )
+
+    def test_child_urls(self):
+        root = Model()
+        root.path = [None, 'root']
+        request = self.layer.new_request()
+        children = list()
+        for name in ['a', 'b/c', 'd e']:
+            child = root[name] = Model()
+            child.path = [None, 'root', name]
+            children.append(child)
+
+        mytile = Tile()
+        mytile.model = root
+        mytile.request = request
+        self.assertEqual(mytile.child_urls(children), [
+            'http://example.com/root/a',
+            'http://example.com/root/b__s_l_a_s_h__c',
+            'http://example.com/root/d%20e'
+        ])
+        self.assertEqual(
+            [node_url(child, request) for child in children],
+            mytile.child_urls(children)
+        )
+        with mock.patch('cone.tile._api.quote') as quote:
+            self.assertEqual(
+                child_urls(root, request, children),
+                mytile.child_urls(children)
+            )
+            self.assertFalse(quote.called)
+
+        # Renamed children get new URLs
+        child = children[0]
+        child.__name__ = 'x'
+        child.path = [None, 'root', 'x']
+        self.assertEqual(
+            child_urls(root, request, [child]),
+            ['http://example.com/root/x']
+        )
+        self.assertEqual(node_url(child, request), 'http://example.com/root/x')
+
+    @secured
+    def test_cached(self, authn):
+        model = Model()
+        model.__acl__ = [(Allow, 'system.Authenticated', ['view'])]
+        request = self.layer.new_request()
+        backend = MemoryTileCache()
+
+        @tile(name='cachedtile', cache=CachePolicy(backend=backend))
+        class CachedTile(Tile):
+            count = 0
+
+            def render(self):
+                CachedTile.count += 1
+                return u'<span>{}</span>'.format(CachedTile.count)
+
+        authn.unauthenticated_userid = lambda *args: 'max'
+        self.assertEqual(
+            render_tile(model, request, 'cachedtile'),
+            u'<span>1</span>'
+        )
+        # Output gets cached
+        self.assertEqual(
+            render_tile(model, request, 'cachedtile'),
+            u'<span>1</span>'
+        )
+        self.assertEqual(len(backend), 1)
+
+        # Security is checked regardless of cached output
+        authn.unauthenticated_userid = lambda *args: None
+        invalidate_security_cache(request)
+        err = self.expectError(
+            HTTPForbidden,
+            render_tile,
+            model,
+            request,
+            'cachedtile'
+        )
+        self.checkOutput("""
+        Unauthorized: tile <cone.tile.tests...CachedTile object at ...>
+        failed permission check
+        """, str(err))
+
+        # Different model identity
+        authn.unauthenticated_userid = lambda *args: 'max'
+        invalidate_security_cache(request)
+        other = Model()
+        other.__acl__ = model.__acl__
+        other.path = [None, 'other']
+        self.assertEqual(
+            render_tile(other, request, 'cachedtile'),
+            u'<span>2</span>'
+        )
+
+        # Output not cached if redirect triggered
+        backend.clear()
+
+        @tile(
+            name='cachedredirect',
+            cache=CachePolicy(backend=backend),
+            permission=None)
+        class CachedRedirectTile(Tile):
+            def render(self):
+                self.redirect('http://example.com')
+                return u'redirect'
+
+        self.assertEqual(render_tile(model, request, 'cachedredirect'), u'')
+        self.assertEqual(len(backend), 0)
+        del request.environ['redirect']
+
+    @secured
+    def test_cached_encoded(self, authn):
+        model = Model()
+        model.__acl__ = [
+            (Allow, 'system.Authenticated', ['view']),
+            (Deny, Everyone, ALL_PERMISSIONS),
+        ]
+        request = self.layer.new_request()
+        authn.unauthenticated_userid = lambda *args: 'max'
+        backend = MemoryTileCache()
+
+        @tile(
+            name='encodedtile',
+            cache=CachePolicy(backend=backend, compress=True),
+            defer=True)
+        class EncodedTile(Tile):
+            count = 0
+
+            def render(self):
+                EncodedTile.count += 1
+                return u'<span>Encoded \xe4 {}</span>'.format(EncodedTile.count)
+
+        # Output is stored as UTF-8 encoded bytes and as gzip compressed bytes
+        expected = u'<span>Encoded \xe4 1</span>'
+        self.assertEqual(render_tile(model, request, 'encodedtile'), expected)
+        key = ('encodedtile', (None,))
+        self.assertEqual(backend.get(key), expected.encode('utf-8'))
+        self.assertEqual(
+            gzip.decompress(backend.get(key + ('gzip',))),
+            expected.encode('utf-8')
+        )
+
+        # Cached output gets decoded if rendered as text
+        self.assertEqual(render_tile(model, request, 'encodedtile'), expected)
+
+        # Streaming responses use pre-encoded output
+        register_tile(name='tileone', path='../testdata/tile1.pt')
+        response = stream_tiles_to_response(
+            model,
+            request,
+            ['tileone', 'encodedtile', 'encodedtile'],
+            eager=2)
+        chunks = list(response.app_iter)
+        self.assertTrue(chunks[1] is backend.get(key))
+        self.assertEqual(
+            b''.join(chunks).decode('utf-8'),
+            u'<span>Tile One</span>' + expected + expected
+        )
+        self.assertEqual(EncodedTile.count, 1)
+
+        # Deferred tile view delivers compressed output
+        request = self.layer.new_request(
+            params={'name': 'encodedtile'},
+            headers={'Accept-Encoding': 'gzip, deflate'})
+        response = deferred_tile_view(model, request)
+        self.assertEqual(response.content_encoding, 'gzip')
+        self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+        self.assertEqual(response.body, backend.get(key + ('gzip',)))
+
+        request = self.layer.new_request(params={'name': 'encodedtile'})
+        response = deferred_tile_view(model, request)
+        self.assertIsNone(response.content_encoding)
+        self.assertEqual(response.text, expected)
+
+        # Security is checked before pre-encoded output is used
+        authn.unauthenticated_userid = lambda *args: None
+        request = self.layer.new_request(
+            params={'name': 'encodedtile'},
+            headers={'Accept-Encoding': 'gzip'})
+        self.expectError(HTTPForbidden, deferred_tile_view, model, request)
+        self.expectError(
+            HTTPForbidden,
+            stream_tiles_to_response,
+            model,
+            request,
+            ['encodedtile'])
+        self.assertEqual(EncodedTile.count, 1)
+
+    def test_cache_invalidation(self):
+        registry = self.layer.registry
+        backend = MemoryTileCache()
+
+        class IModified(IObjectEvent):
+            pass
+
+        @implementer(IModified)
+        class Modified(ObjectEvent):
+            pass
+
+        @implementer(IModified)
+        class Moved(ObjectEvent):
+            def __init__(self, ob, old_parent, old_name):
+                super(Moved, self).__init__(ob)
+                self.oldParent = old_parent
+                self.oldName = old_name
+
+        class IItem(Interface):
+            pass
+
+        class Node(testing.DummyResource):
+            @property
+            def path(self):
+                return [node.__name__ for node in reversed(list(lineage(self)))]
+
+        root = Node()
+        folder = root['folder'] = Node()
+        item = folder['item'] = Node()
+        other = folder['other'] = Node()
+        alsoProvides(item, IItem)
+        alsoProvides(other, IItem)
+        rendered = []
+
+        @tile(
+            name='evlisting',
+            permission=None,
+            cache=CachePolicy(
+                backend=backend,
+                events=[IModified],
+                ancestors=True))
+        class EventListingTile(Tile):
+            def render(self):
+                rendered.append(('evlisting', self.model.__name__))
+                return u'listing'
+
+        @tile(
+            name='evitem',
+            interface=IItem,
+            permission=None,
+            cache=CachePolicy(backend=backend, events=[IModified]))
+        class EventItemTile(Tile):
+            def render(self):
+                rendered.append(('evitem', self.model.__name__))
+                return u'item'
+
+        def render_all():
+            request = self.layer.new_request()
+            for model in (root, folder, item, other):
+                render_tile(model, request, 'evlisting')
+            for model in (item, other):
+                render_tile(model, request, 'evitem')
+
+        render_all()
+        self.assertEqual(len(rendered), 6)
+        self.assertEqual(len(backend), 6)
+
+        # Only affected entries are invalidated. Ancestors are considered if
+        # defined by cache policy
+        del rendered[:]
+        registry.notify(Modified(item))
+        self.assertEqual(len(backend), 2)
+        render_all()
+        self.assertEqual(rendered, [
+            ('evlisting', None),
+            ('evlisting', 'folder'),
+            ('evlisting', 'item'),
+            ('evitem', 'item')
+        ])
+
+        # Only objects providing the tile interface are considered
+        del rendered[:]
+        registry.notify(Modified(folder))
+        render_all()
+        self.assertEqual(rendered, [
+            ('evlisting', None),
+            ('evlisting', 'folder')
+        ])
+
+        # Former location of moved objects is considered
+        del rendered[:]
+        del folder['other']
+        moved = root['moved'] = other
+        moved.__name__ = 'moved'
+        registry.notify(Moved(moved, folder, 'other'))
+        request = self.layer.new_request()
+        render_tile(folder, request, 'evlisting')
+        render_tile(moved, request, 'evlisting')
+        self.assertEqual(rendered, [
+            ('evlisting', 'folder'),
+            ('evlisting', 'moved')
+        ])
+        old_key = (None, 'folder', 'other')
+        self.assertIsNone(backend.get(('evitem', old_key)))
+        self.assertIsNone(backend.get(('evlisting', old_key)))
+
+        # Handlers get unregistered if tile gets overwritten
+        handlers = len(list(registry.registeredHandlers()))
+        register_tile(
+            name='evitem',
+            interface=IItem,
+            permission=None,
+            cache=CachePolicy(backend=backend, events=[IModified]))
+        self.assertEqual(len(list(registry.registeredHandlers())), handlers)
+        register_tile(name='evitem', interface=IItem, permission=None)
+        self.assertEqual(
+            len(list(registry.registeredHandlers())),
+            handlers - 1
+        )
+
+    def test_memoize(self):
+        model = Model()
+        request = self.layer.new_request()
+
+        @tile(
+            name='memotile',
+            permission=None,
+            memoize=True,
+            freshness=lambda model, request: getattr(model, 'version', 0))
+        class MemoTile(Tile):
+            count = 0
+
+            def prepare(self):
+                MemoTile.count += 1
+
+            def render(self):
+                return u'<span>{}</span>'.format(MemoTile.count)
+
+        # Repeated rendering on same model returns memoized output
+        self.assertEqual(
+            render_tile(model, request, 'memotile'),
+            u'<span>1</span>'
+        )
+        self.assertEqual(
+            TileRenderer(model, request)('memotile'),
+            u'<span>1</span>'
+        )
+
+        # Memo is scoped to model and request
+        other = Model()
+        self.assertEqual(
+            render_tile(other, request, 'memotile'),
+            u'<span>2</span>'
+        )
+        self.assertEqual(
+            render_tile(model, self.layer.new_request(), 'memotile'),
+            u'<span>3</span>'
+        )
+        self.assertEqual(
+            render_tile(model, request, 'memotile'),
+            u'<span>1</span>'
+        )
+
+        # Changed freshness token invalidates memoized output
+        model.version = 1
+        self.assertEqual(
+            render_tile(model, request, 'memotile'),
+            u'<span>4</span>'
+        )
+
+        # Explicit invalidation by model
+        invalidate_tile_memo(request, model)
+        self.assertEqual(
+            render_tile(model, request, 'memotile'),
+            u'<span>5</span>'
+        )
+        self.assertEqual(
+            render_tile(other, request, 'memotile'),
+            u'<span>2</span>'
+        )
+
+        # Explicit invalidation of all output
+        invalidate_tile_memo(request)
+        self.assertEqual(
+            render_tile(other, request, 'memotile'),
+            u'<span>6</span>'
+        )
+
+        # Redirect invalidates memoized output
+        @tile(name='memoredirect', permission=None)
+        class MemoRedirectTile(Tile):
+            def render(self):
+                self.redirect('http://example.com')
+
+        render_tile(model, request, 'memoredirect')
+        self.assertFalse('cone.tile.memo' in request.environ)
+        del request.environ['redirect']
+        self.assertEqual(
+            render_tile(model, request, 'memotile'),
+            u'<span>7</span>'
+        )
+
+        # Output is not memoized if redirect triggered while rendering
+        @tile(name='memoredirecttwo', permission=None, memoize=True)
+        class MemoRedirectTwoTile(Tile):
+            def render(self):
+                self.redirect('http://example.com')
+                return u'redirect'
+
+        self.assertEqual(render_tile(model, request, 'memoredirecttwo'), u'')
+        self.assertFalse('cone.tile.memo' in request.environ)
+        del request.environ['redirect']
+
+        # Asynchronous tiles
+        @tile(name='memoasync', permission=None, memoize=True)
+        class MemoAsyncTile(Tile):
+            count = 0
+
+            async def render(self):
+                MemoAsyncTile.count += 1
+                return u'<span>{}</span>'.format(MemoAsyncTile.count)
+
+        self.assertEqual(
+            asyncio.run(render_tile_async(model, request, 'memoasync')),
+            u'<span>1</span>'
+        )
+        self.assertEqual(
+            asyncio.run(render_tile_async(model, request, 'memoasync')),
+            u'<span>1</span>'
+        )
+
+    @secured
+    def test_data_providers(self, authn):
+        calls = []
+
+        def titles(models, request):
+            calls.append(('titles', [model.__name__ for model in models]))
+            return [model.__name__.upper() for model in models]
+
+        def counts(models, request):
+            calls.append(('counts', [model.__name__ for model in models]))
+            return [len(model) for model in models]
+
+        register_data_provider('titles', titles)
+        register_data_provider('counts', counts)
+
+        @tile(name='datatitle', permission=None, providers=['titles'])
+        class DataTitleTile(Tile):
+            def render(self):
+                return self.provided_data('titles')
+
+        @tile(
+            name='datasummary',
+            permission=None,
+            providers=['titles', 'counts'])
+        class DataSummaryTile(Tile):
+            def render(self):
+                return u'{} ({})'.format(
+                    self.provided_data('titles'),
+                    self.provided_data('counts'))
+
+        root = Model()
+        a = root['a'] = Model()
+        b = root['b'] = Model()
+        a['c'] = Model()
+        request = self.layer.new_request()
+
+        # Data is fetched at once for all tiles before rendering
+        rendered = render_tiles(root, request, [
+            ('datatitle', a),
+            ('datasummary', b),
+            ('datasummary', a)
+        ])
+        self.assertEqual(list(rendered.values()), [u'A', u'B (0)', u'A (1)'])
+        self.assertEqual(calls, [
+            ('titles', ['a', 'b']),
+            ('counts', ['b', 'a'])
+        ])
+
+        # Prefetching for layouts rendering tiles via templates
+        del calls[:]
+        request = self.layer.new_request()
+        prefetch_data(a, request, ['datatitle', ('datatitle', b)])
+        self.assertEqual(calls, [('titles', ['a', 'b'])])
+        self.assertEqual(TileRenderer(b, request)('datatitle'), u'B')
+        self.assertEqual(calls, [('titles', ['a', 'b'])])
+
+        # Tiles not permitted and deferred tiles are skipped by prefetching
+        @tile(name='datadenied', providers=['counts'])
+        class DataDeniedTile(Tile):
+            pass
+
+        @tile(
+            name='datadeferred',
+            permission=None,
+            providers=['counts'],
+            defer=True)
+        class DataDeferredTile(Tile):
+            pass
+
+        del calls[:]
+        authn.unauthenticated_userid = lambda *args: None
+        prefetch_data(a, request, ['datadenied', 'datadeferred', 'inexistent'])
+        self.assertEqual(calls, [])
+
+        # Changing the model invalidates fetched data
+        self.assertEqual(render_tile(a, request, 'datasummary'), u'A (1)')
+        self.assertEqual(calls, [('counts', ['a'])])
+        a['d'] = Model()
+        invalidate_tile_memo(request, a)
+        self.assertEqual(render_tile(a, request, 'datasummary'), u'A (2)')
+        self.assertEqual(calls, [
+            ('counts', ['a']),
+            ('titles', ['a']),
+            ('counts', ['a'])
+        ])
+
+    @secured
+    def test_security_cache(self, authn):
+        @tile(name='memo_view', permission='view')
+        class MemoView(Tile):
+            def render(self):
+                return u'memo view'
+
+        model = Model()
+        model.__acl__ = [
+            (Allow, 'system.Authenticated', ['view']),
+            (Deny, Everyone, ALL_PERMISSIONS),
+        ]
+        request = self.layer.new_request()
+
+        calls = []
+        effective_principals = authn.effective_principals
+
+        def counting_principals(request):
+            calls.append(request)
+            return effective_principals(request)
+
+        authn.effective_principals = counting_principals
+        authn.unauthenticated_userid = lambda *args: 'max'
+
+        # Principals and permission check results are cached on request
+        for i in range(3):
+            self.assertEqual(
+                render_tile(model, request, 'memo_view'),
+                u'memo view'
+            )
+        self.assertEqual(len(calls), 1)
+        cache = request.environ['cone.tile.security']
+        self.assertEqual(len(cache), 2)
+
+        # Other models are checked separately
+        other = Model()
+        other.__acl__ = [(Deny, Everyone, ALL_PERMISSIONS)]
+        self.expectError(
+            HTTPForbidden,
+            render_tile,
+            other,
+            request,
+            'memo_view'
+        )
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(cache), 3)
+
+        # A new request resolves principals again
+        other_request = self.layer.new_request()
+        render_tile(model, other_request, 'memo_view')
+        self.assertEqual(len(calls), 2)
+
+        # Invalidate cache, i.e. after logout
+        authn.unauthenticated_userid = lambda *args: None
+        invalidate_security_cache(request)
+        self.assertFalse('cone.tile.security' in request.environ)
+        self.expectError(
+            HTTPForbidden,
+            render_tile,
+            model,
+            request,
+            'memo_view'
+        )
+        self.assertEqual(len(calls), 3)
+
+    @secured
+    def test_profiling(self, authn):
+        register_tile(name='tileone', path='../testdata/tile1.pt')
+
+        @tile(name='profiled_outer', path='../testdata/tile2.pt')
+        class ProfiledOuter(Tile):
+            data = u'data'
+
+        model = Model()
+        model.__acl__ = [(Allow, Everyone, ['view'])]
+        request = self.layer.new_request()
+        authn.unauthenticated_userid = lambda *args: None
+        profile = enable_profiling(request)
+
+        events = []
+        self.layer.registry.registerHandler(events.append, [ITileRendered])
+        try:
+            render_tile(model, request, 'profiled_outer')
+        finally:
+            self.layer.registry.unregisterHandler(
+                events.append,
+                [ITileRendered]
+            )
+
+        outer = profile.roots[0]
+        self.assertEqual(outer.name, 'profiled_outer')
+        self.assertEqual(outer.depth, 0)
+        self.assertEqual(
+            sorted(outer.phases.keys()),
+            ['prepare', 'security', 'template']
+        )
+        inner = outer.children[0]
+        self.assertEqual(inner.name, 'tileone')
+        self.assertEqual(inner.depth, 1)
+        self.assertTrue(outer.duration >= inner.duration)
+        self.assertEqual([event.timing for event in events], [inner, outer])
+
+        # No profiling by default
+        request = self.layer.new_request()
+        render_tile(model, request, 'profiled_outer')
+        self.assertIsNone(get_profile(request))
 
     @secured
     def test_secured(self, authn):
@@ -621,6 +2549,7 @@ class TestTile(TileTestCase):
 
         # Set authenticated to 'max'
         authn.unauthenticated_userid = lambda *args: 'max'
+        invalidate_security_cache(request)
 
         # Authenticated users are allowed to view tiles protected by view
         # permission
@@ -641,6 +2570,7 @@ class TestTile(TileTestCase):
 
         # Set authenticated to 'editor_user'
         authn.unauthenticated_userid = lambda *args: 'editor_user'
+        invalidate_security_cache(request)
 
         # Editor is allowed to render edit permission protected tiles
         self.assertEqual(
@@ -660,6 +2590,7 @@ class TestTile(TileTestCase):
 
         # Set User to 'admin_user'
         authn.unauthenticated_userid = lambda *args: 'admin_user'
+        invalidate_security_cache(request)
 
         # Admin users are allowed to render delete permission protected tiles
         # and others
@@ -697,6 +2628,7 @@ class TestTile(TileTestCase):
             pass
 
         authn.unauthenticated_userid = lambda *args: None
+        invalidate_security_cache(request)
 
         self.layer.logger.clear()
 